@@ -1,28 +1,11 @@
 #Implement the DDA algorithm as a functon that return x and y coordinate lists in python
 import matplotlib.pyplot as plt
 
-def dda(x1, y1, x2, y2):
-    x = []
-    y = []
-
-    dx = x2 - x1
-    dy = y2 - y1
-
-    steps = int(max(abs(dx), abs(dy)))
-
-    x_inc = dx / steps
-    y_inc = dy / steps
+from cgv.raster import dda as raster_dda
 
-    x_curr = x1
-    y_curr = y1
-
-    for _ in range(steps + 1):
-        x.append(x_curr)
-        y.append(y_curr)
-        x_curr += x_inc
-        y_curr += y_inc
-
-    return x, y
+def dda(x1, y1, x2, y2):
+    points = raster_dda(x1, y1, x2, y2)
+    return [x for x, _ in points], [y for _, y in points]
 
 
 x_points, y_points = dda(2, 3, 10, 8)
@@ -0,0 +1,138 @@
+"""Headless snake engine that advances many independent games at once.
+
+Same rules as snake_logic.SnakeState, on a board measured in cells rather
+than pixels. Every array has the batch as its first axis, so one step()
+call moves all games with a handful of NumPy operations.
+
+    python snake_batch.py --bench
+"""
+import argparse
+import time
+
+import numpy as np
+
+from snake_logic import CELL, HEIGHT, WIDTH
+
+# Action i moves by MOVES[i] = (dx, dy) in cells: up, down, left, right.
+MOVES = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)])
+OPPOSITE = np.array([1, 0, 3, 2])
+EMPTY = np.iinfo(np.int64).min // 2
+
+
+class SnakeBatch:
+    def __init__(self, batch, cols=WIDTH // CELL, rows=HEIGHT // CELL, seed=None):
+        self.batch = batch
+        self.cols = cols
+        self.rows = rows
+        self.rng = np.random.default_rng(seed)
+        self.games = np.arange(batch)
+        # stamp[g, y, x] is the tick at which the head entered the cell. A
+        # cell is part of the body while stamp > tick - length, so the tail
+        # drops off without any per-segment bookkeeping.
+        self.stamp = np.full((batch, rows, cols), EMPTY, dtype=np.int64)
+        self.head = np.zeros((batch, 2), dtype=np.int64)
+        self.direction = np.zeros(batch, dtype=np.int64)
+        self.length = np.zeros(batch, dtype=np.int64)
+        self.score = np.zeros(batch, dtype=np.int64)
+        self.alive = np.zeros(batch, dtype=bool)
+        self.food = np.zeros((batch, 2), dtype=np.int64)
+        self.tick = 0
+        self.reset()
+
+    def reset(self, mask=None):
+        """Restart the games selected by ``mask`` (all games by default)."""
+        games = self.games if mask is None else self.games[mask]
+        cx, cy = self.cols // 2, self.rows // 2
+        self.stamp[games] = EMPTY
+        for i in range(3):
+            self.stamp[games, cy, cx - i] = self.tick - i
+        self.head[games] = (cx, cy)
+        self.direction[games] = 3
+        self.length[games] = 3
+        self.score[games] = 0
+        self.alive[games] = True
+        self.spawn_food(games)
+
+    def occupied(self, games=None):
+        games = self.games if games is None else games
+        return self.stamp[games] > self.tick - self.length[games, None, None]
+
+    def spawn_food(self, games):
+        # A few rounds of vectorized rejection sampling settle almost every
+        # game; the rest pick exactly among their free cells.
+        pending = games
+        for _ in range(4):
+            if not pending.size:
+                return
+            x = self.rng.integers(0, self.cols, pending.size)
+            y = self.rng.integers(0, self.rows, pending.size)
+            ok = self.stamp[pending, y, x] <= self.tick - self.length[pending]
+            self.food[pending[ok]] = np.column_stack([x[ok], y[ok]])
+            pending = pending[~ok]
+        for g in pending:
+            cells = np.flatnonzero(~self.occupied(g))
+            if cells.size:
+                y, x = divmod(self.rng.choice(cells), self.cols)
+                self.food[g] = (x, y)
+            else:
+                self.alive[g] = False
+
+    def step(self, actions):
+        """Advance every live game by one tick.
+
+        ``actions`` holds one of 0-3 (up, down, left, right) per game;
+        turning straight back is ignored. Returns (ate, died) masks; a game
+        that fills the board ends this tick and is reported in ``died``.
+        """
+        actions = np.asarray(actions)
+        turn = actions != OPPOSITE[self.direction]
+        self.direction = np.where(turn, actions, self.direction)
+
+        new_head = self.head + MOVES[self.direction]
+        x, y = new_head.T
+        inside = (x >= 0) & (x < self.cols) & (y >= 0) & (y < self.rows)
+        xs, ys = np.clip(x, 0, self.cols - 1), np.clip(y, 0, self.rows - 1)
+        # The tail has not moved out yet, so running into it still counts.
+        hit = self.stamp[self.games, ys, xs] > self.tick - self.length
+        died = self.alive & (~inside | hit)
+        moving = self.alive & ~died
+        self.alive &= ~died
+
+        self.tick += 1
+        g = self.games[moving]
+        self.head[g] = new_head[g]
+        self.stamp[g, ys[g], xs[g]] = self.tick
+        ate = moving & (new_head == self.food).all(axis=1)
+        self.length += ate
+        self.score += ate
+        if ate.any():
+            self.spawn_food(self.games[ate])
+            died |= ate & ~self.alive
+        return ate, died
+
+
+def benchmark(batch_sizes=(1, 4, 16, 64, 256, 1024, 4096), steps=200, seed=0):
+    rng = np.random.default_rng(seed)
+    for batch in batch_sizes:
+        games = SnakeBatch(batch, seed=seed)
+        actions = rng.integers(0, 4, (steps, batch))
+        start = time.perf_counter()
+        for a in actions:
+            _, died = games.step(a)
+            if died.any():
+                games.reset(died)
+        elapsed = time.perf_counter() - start
+        print(f"batch {batch:>5}: {batch * steps / elapsed:>12,.0f} game-steps/s "
+              f"({elapsed / steps * 1e6:8.1f} us/step)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched headless snake engine")
+    parser.add_argument("--bench", action="store_true", help="report steps/second for batch sizes 1 to 4096")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(steps=args.steps, seed=args.seed)
+    else:
+        parser.print_help()
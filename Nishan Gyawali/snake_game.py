@@ -1,9 +1,11 @@
+import os
 import pygame
-import random
 import sys
+import time
+
+from snake_logic import CELL, DOWN, HEIGHT, LEFT, RIGHT, UP, WIDTH, SnakeState, benchmark, benchmark_food
+from snake_profile import FrameProfiler, NullProfiler
 
-WIDTH, HEIGHT = 800, 600
-CELL = 20
 FPS = 12
 
 BLACK = (0, 0, 0)
@@ -12,75 +14,181 @@ GREEN = (0, 200, 0)
 DARK_GREEN = (0, 140, 0)
 RED = (220, 0, 0)
 
-def random_food_position(snake):
-    while True:
-        x = random.randrange(0, WIDTH, CELL)
-        y = random.randrange(0, HEIGHT, CELL)
-        if (x, y) not in snake:
-            return (x, y)
-
-def main():
+KEYS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+
+def draw_full(screen, font, state):
+    screen.fill(BLACK)
+    if state.food is not None:
+        pygame.draw.rect(screen, RED, (*state.food, CELL, CELL))
+
+    for i, (x, y) in enumerate(state.snake):
+        color = GREEN if i == 0 else DARK_GREEN
+        pygame.draw.rect(screen, color, (x, y, CELL, CELL))
+
+    text = font.render(f"Score: {state.score}", True, WHITE)
+    screen.blit(text, (10, 10))
+
+    if state.game_over:
+        over = font.render("GAME OVER", True, WHITE)
+        screen.blit(over, (WIDTH//2 - 100, HEIGHT//2))
+
+    return [screen.get_rect()]
+
+class DirtyRenderer:
+    # Redraws only what changed since the previous frame: per tick that is
+    # the old and new head, the tail cell that was vacated and the food.
+    # The score surface is rendered again only when the score changes.
+    # draw() returns the rects to hand to pygame.display.update().
+    def __init__(self, screen, font):
+        self.screen = screen
+        self.font = font
+        self.score = None
+        self.score_surface = None
+        self.score_rect = pygame.Rect(10, 10, 0, 0)
+        self.last = None
+
+    def cell(self, cell, color):
+        return pygame.draw.rect(self.screen, color, (*cell, CELL, CELL))
+
+    def cell_color(self, state, cell):
+        if cell == state.snake.head:
+            return GREEN
+        if cell in state.snake:
+            return DARK_GREEN
+        if cell == state.food:
+            return RED
+        return BLACK
+
+    def draw(self, state):
+        snake = state.snake
+        if self.last is None:
+            rects = draw_full(self.screen, self.font, state)
+            self.score = state.score
+            self.score_surface = self.font.render(f"Score: {state.score}", True, WHITE)
+            self.score_rect = self.score_surface.get_rect(topleft=(10, 10))
+        else:
+            head, tail, food, length, game_over = self.last
+            rects = []
+            if snake.head != head:
+                rects.append(self.cell(head, DARK_GREEN))
+                rects.append(self.cell(snake.head, GREEN))
+                if len(snake) == length:
+                    rects.append(self.cell(tail, BLACK))
+            if state.food != food and state.food is not None:
+                rects.append(self.cell(state.food, RED))
+
+            old_score_rect = self.score_rect
+            if state.score != self.score:
+                self.score = state.score
+                self.score_surface = self.font.render(f"Score: {state.score}", True, WHITE)
+                self.score_rect = self.score_surface.get_rect(topleft=(10, 10))
+                rects.append(self.redraw_score(state, old_score_rect.union(self.score_rect)))
+            elif self.score_rect.collidelist(rects) != -1:
+                rects.append(self.redraw_score(state, self.score_rect))
+
+            if state.game_over and not game_over:
+                over = self.font.render("GAME OVER", True, WHITE)
+                rects.append(self.screen.blit(over, (WIDTH//2 - 100, HEIGHT//2)))
+
+        self.last = (snake.head, snake.body[-1], state.food, len(snake), state.game_over)
+        return rects
+
+    def redraw_score(self, state, area):
+        # The text is drawn over the board, so repaint the cells under it
+        # before blitting it again.
+        left, top = area.left // CELL * CELL, area.top // CELL * CELL
+        right, bottom = -(-area.right // CELL) * CELL, -(-area.bottom // CELL) * CELL
+        for y in range(top, bottom, CELL):
+            for x in range(left, right, CELL):
+                self.cell((x, y), self.cell_color(state, (x, y)))
+        self.screen.blit(self.score_surface, self.score_rect)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+def main(seed=None, profiler=None):
+    profiler = profiler or NullProfiler()
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Snake Game")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("arial", 30)
 
-    snake = [(400, 300), (380, 300), (360, 300)]
-    direction = (CELL, 0)
-    pending = direction
-    food = random_food_position(snake)
-    score = 0
-    game_over = False
+    state = SnakeState(seed)
+    renderer = DirtyRenderer(screen, font)
 
     while True:
         clock.tick(FPS)
+        profiler.begin()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP and direction != (0, CELL):
-                    pending = (0, -CELL)
-                elif event.key == pygame.K_DOWN and direction != (0, -CELL):
-                    pending = (0, CELL)
-                elif event.key == pygame.K_LEFT and direction != (CELL, 0):
-                    pending = (-CELL, 0)
-                elif event.key == pygame.K_RIGHT and direction != (-CELL, 0):
-                    pending = (CELL, 0)
-
-        if not game_over:
-            direction = pending
-            head_x, head_y = snake[0]
-            new_head = (head_x + direction[0], head_y + direction[1])
-
-            if new_head in snake or new_head[0] < 0 or new_head[0] >= WIDTH or new_head[1] < 0 or new_head[1] >= HEIGHT:
-                game_over = True
-            else:
-                snake.insert(0, new_head)
-                if new_head == food:
-                    score += 1
-                    food = random_food_position(snake)
-                else:
-                    snake.pop()
-
-        screen.fill(BLACK)
-        pygame.draw.rect(screen, RED, (*food, CELL, CELL))
-
-        for i, (x, y) in enumerate(snake):
-            color = GREEN if i == 0 else DARK_GREEN
-            pygame.draw.rect(screen, color, (x, y, CELL, CELL))
-
-        text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(text, (10, 10))
-
-        if game_over:
-            over = font.render("GAME OVER", True, WHITE)
-            screen.blit(over, (WIDTH//2 - 100, HEIGHT//2))
+            if event.type == pygame.KEYDOWN and event.key in KEYS:
+                state.steer(KEYS[event.key])
+        profiler.lap("events")
+
+        state.step()
+        profiler.lap("step")
+        rects = renderer.draw(state)
+        profiler.lap("draw")
+        pygame.display.update(rects)
+        profiler.lap("flip")
+        profiler.end()
+
+def autopilot(state):
+    # Greedy: of the moves that do not hit a wall or the body, take the
+    # one that ends closest to the food. Good enough to drive a benchmark.
+    head_x, head_y = state.snake.head
+    food_x, food_y = state.food if state.food is not None else state.snake.head
+    best = None
+    for direction in (state.direction, UP, RIGHT, DOWN, LEFT):
+        x, y = head_x + direction[0], head_y + direction[1]
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT and (x, y) not in state.snake:
+            distance = abs(x - food_x) + abs(y - food_y)
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+    if best is not None:
+        state.steer(best[1])
+
+def benchmark_render(frames=2000, seed=0):
+    # Full redraw vs dirty rects, headless through SDL's dummy driver.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont("arial", 30)
 
-        pygame.display.update()
+    for name in ("full redraw", "dirty rects"):
+        state = SnakeState(seed)
+        renderer = DirtyRenderer(screen, font)
+        start = time.perf_counter()
+        for _ in range(frames):
+            autopilot(state)
+            state.step()
+            if state.game_over:
+                state = SnakeState(seed)
+                renderer = DirtyRenderer(screen, font)
+            if name == "full redraw":
+                pygame.display.update(draw_full(screen, font, state))
+            else:
+                pygame.display.update(renderer.draw(state))
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / frames * 1e6:8.1f} us/frame")
+    pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    args = sys.argv[1:]
+    if "--bench" in args:
+        benchmark()
+        benchmark_food()
+        benchmark_render()
+    else:
+        seed = int(args[args.index("--seed") + 1]) if "--seed" in args else None
+        profiler = None
+        if "--profile" in args:
+            # --profile [frames.csv]: per-stage timings, written at exit.
+            i = args.index("--profile") + 1
+            path = args[i] if i < len(args) and not args[i].startswith("--") else "snake_profile.csv"
+            profiler = FrameProfiler()
+            profiler.dump_at_exit(path)
+        main(seed, profiler)
@@ -0,0 +1,159 @@
+import random
+import time
+from collections import deque
+
+WIDTH, HEIGHT = 800, 600
+CELL = 20
+
+UP, DOWN, LEFT, RIGHT = (0, -CELL), (0, CELL), (-CELL, 0), (CELL, 0)
+
+class FreeCells:
+    # Every board cell not covered by the snake, in a list that is kept
+    # dense by swap-removing, plus each cell's index in that list. Taking,
+    # releasing and picking a random free cell are all O(1).
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.cells = [(x, y) for y in range(0, height, CELL) for x in range(0, width, CELL)]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def take(self, cell):
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def release(self, cell):
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng=random):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+class Snake:
+    # Body cells head-first in a deque plus a set of the same cells, so
+    # moving, growing and "is this cell part of the snake" are all O(1).
+    # With a FreeCells index the snake keeps it in step as it moves.
+    def __init__(self, cells, free=None):
+        self.body = deque(cells)
+        self.occupied = set(self.body)
+        self.free = free
+        if free is not None:
+            for cell in self.occupied:
+                free.take(cell)
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        return iter(self.body)
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    def move(self, new_head, grow=False):
+        self.body.appendleft(new_head)
+        self.occupied.add(new_head)
+        if self.free is not None:
+            self.free.take(new_head)
+        if not grow:
+            tail = self.body.pop()
+            if tail != new_head:
+                self.occupied.discard(tail)
+                if self.free is not None:
+                    self.free.release(tail)
+
+def advance(snake, direction, food, width=WIDTH, height=HEIGHT):
+    """Move the snake one cell; returns (game_over, ate_food)."""
+    head_x, head_y = snake.head
+    new_head = (head_x + direction[0], head_y + direction[1])
+
+    # The tail has not moved out yet, so running into it still counts.
+    if new_head in snake or new_head[0] < 0 or new_head[0] >= width or new_head[1] < 0 or new_head[1] >= height:
+        return True, False
+    ate = new_head == food
+    snake.move(new_head, grow=ate)
+    return False, ate
+
+def random_food_position(snake, rng=random):
+    # O(1) pick from the free-cell index; None once the board is full.
+    if snake.free is not None:
+        return snake.free.choice(rng)
+    while True:
+        x = rng.randrange(0, WIDTH, CELL)
+        y = rng.randrange(0, HEIGHT, CELL)
+        if (x, y) not in snake:
+            return (x, y)
+
+class SnakeState:
+    # Everything one game needs to advance, with no pygame in sight, so
+    # the same step runs in the window, in tests and in benchmarks.
+    def __init__(self, seed=None, width=WIDTH, height=HEIGHT):
+        self.rng = random.Random(seed)
+        self.width = width
+        self.height = height
+        cx, cy = width // 2 // CELL * CELL, height // 2 // CELL * CELL
+        self.snake = Snake([(cx, cy), (cx - CELL, cy), (cx - 2 * CELL, cy)],
+                           FreeCells(width, height))
+        self.direction = RIGHT
+        self.pending = RIGHT
+        self.food = random_food_position(self.snake, self.rng)
+        self.score = 0
+        self.game_over = False
+
+    def steer(self, direction):
+        # Turning straight back into the body is ignored.
+        if direction != (-self.direction[0], -self.direction[1]):
+            self.pending = direction
+
+    def step(self):
+        """Advance one tick; returns True if the snake ate this tick."""
+        if self.game_over:
+            return False
+        self.direction = self.pending
+        self.game_over, ate = advance(self.snake, self.direction, self.food,
+                                      self.width, self.height)
+        if ate:
+            self.score += 1
+            self.food = random_food_position(self.snake, self.rng)
+            if self.food is None:
+                self.game_over = True
+        return ate
+
+def benchmark(lengths=(3, 100, 1000, 10000), ticks=100000):
+    # Headless: a straight snake of each length on a one-row board long
+    # enough that it can keep moving right for every timed tick.
+    for length in lengths:
+        snake = Snake([((length - 1 - i) * CELL, 0) for i in range(length)])
+        width = (length + ticks) * CELL
+        start = time.perf_counter()
+        for _ in range(ticks):
+            advance(snake, (CELL, 0), None, width, CELL)
+        elapsed = time.perf_counter() - start
+        print(f"length {length:>6}: {elapsed / ticks * 1e9:8.1f} ns/tick")
+
+def benchmark_food(fills=(0.1, 0.5, 0.9, 0.99, 0.999), spawns=100000, seed=0):
+    # Headless: cover a fraction of a 100x100 board with snake cells, then
+    # time food placement from the free-cell index.
+    rng = random.Random(seed)
+    width = height = 100 * CELL
+    for fill in fills:
+        free = FreeCells(width, height)
+        cells = rng.sample(free.cells, int(fill * len(free)))
+        snake = Snake(cells, free)
+        start = time.perf_counter()
+        for _ in range(spawns):
+            random_food_position(snake, rng)
+        elapsed = time.perf_counter() - start
+        print(f"fill {fill:6.1%}: {elapsed / spawns * 1e9:8.1f} ns/spawn")
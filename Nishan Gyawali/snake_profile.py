@@ -0,0 +1,81 @@
+import atexit
+import csv
+import time
+from array import array
+
+STAGES = ("events", "step", "draw", "flip")
+
+class FrameProfiler:
+    # Per-stage frame timings in a fixed-size ring buffer: call begin() at
+    # the top of a frame, lap(stage) after each stage and end() at the
+    # bottom. Only the last `capacity` frames are kept.
+    def __init__(self, stages=STAGES, capacity=4096, clock=time.perf_counter):
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self.clock = clock
+        self.index = {stage: i for i, stage in enumerate(self.stages)}
+        self.samples = [array("d", bytes(8 * capacity)) for _ in self.stages]
+        self.frames = 0
+        self._slot = 0
+        self._last = 0.0
+
+    def begin(self):
+        self._slot = self.frames % self.capacity
+        self._last = self.clock()
+
+    def lap(self, stage):
+        now = self.clock()
+        self.samples[self.index[stage]][self._slot] = now - self._last
+        self._last = now
+
+    def end(self):
+        self.frames += 1
+
+    def rows(self):
+        # Recorded frames, oldest first, as one tuple of stage times each.
+        n = min(self.frames, self.capacity)
+        start = self.frames - n
+        return [tuple(s[(start + i) % self.capacity] for s in self.samples) for i in range(n)]
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """{stage: {q: seconds}} for every stage plus the whole "frame"."""
+        rows = self.rows()
+        columns = dict(zip(self.stages, zip(*rows))) if rows else {s: () for s in self.stages}
+        columns["frame"] = [sum(row) for row in rows]
+        result = {}
+        for name, values in columns.items():
+            ordered = sorted(values)
+            result[name] = {q: ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+                            for q in qs}
+        return result
+
+    def report(self):
+        lines = [f"{'stage':8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"]
+        for name, p in self.percentiles().items():
+            lines.append(f"{name:8s} {p[50] * 1e3:8.3f} {p[95] * 1e3:8.3f} {p[99] * 1e3:8.3f}")
+        return "\n".join(lines)
+
+    def dump_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *(f"{s}_ms" for s in self.stages), "total_ms"])
+            first = self.frames - min(self.frames, self.capacity)
+            for i, row in enumerate(self.rows()):
+                writer.writerow([first + i, *(f"{t * 1e3:.4f}" for t in row), f"{sum(row) * 1e3:.4f}"])
+
+    def dump_at_exit(self, path):
+        def dump():
+            self.dump_csv(path)
+            print(self.report())
+        atexit.register(dump)
+
+class NullProfiler:
+    # Stand-in used when profiling is off; every hook is an empty call.
+    def begin(self):
+        pass
+
+    def lap(self, stage):
+        pass
+
+    def end(self):
+        pass
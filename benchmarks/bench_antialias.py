@@ -0,0 +1,44 @@
+"""Xiaolin Wu anti-aliased lines vs plain Bresenham, rasterized and drawn.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_antialias [--segments 20000] [--size 1000] [--repeat 3]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.framebuffer import Framebuffer
+from cgv.raster import bresenham_batch, draw_wu, get_rasterizer, wu_batch
+
+from .workloads import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=20_000)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="report the best of this many runs")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    segments = rng.uniform(0, args.size - 1, (args.segments, 4))
+    integer = np.rint(segments).astype(np.int64)
+    bresenham = get_rasterizer("bresenham")
+
+    plain, _ = timed(bresenham_batch, integer, repeat=args.repeat)
+    smooth, _ = timed(wu_batch, segments, repeat=args.repeat)
+    print(f"rasterize  bresenham={plain * 1e3:8.1f} ms wu={smooth * 1e3:8.1f} ms "
+          f"ratio={smooth / plain:5.2f}x")
+
+    fb = Framebuffer(args.size, args.size)
+    plain, _ = timed(bresenham.draw, fb, integer, (255, 255, 255), repeat=args.repeat)
+    fb = Framebuffer(args.size, args.size)
+    smooth, _ = timed(draw_wu, fb, segments, (255, 255, 255), repeat=args.repeat)
+    print(f"draw       bresenham={plain * 1e3:8.1f} ms wu={smooth * 1e3:8.1f} ms "
+          f"ratio={smooth / plain:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
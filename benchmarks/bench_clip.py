@@ -0,0 +1,35 @@
+"""Cohen-Sutherland vs Liang-Barsky on inside-, outside- and crossing-heavy
+workloads, scalar and batch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_clip [--segments 1000000]
+"""
+import argparse
+
+from cgv.raster.clip import CLIPPERS
+
+from .workloads import CLIP_WINDOW, clip_segments, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=1_000_000)
+    parser.add_argument("--scalar-segments", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for workload in ("inside", "outside", "crossing"):
+        segments = clip_segments(workload, args.segments, args.seed)
+        rows = segments[:args.scalar_segments].tolist()
+        for method, (scalar, batch) in CLIPPERS.items():
+            t_scalar, _ = timed(lambda: [scalar(*row, *CLIP_WINDOW) for row in rows])
+            t_batch, _ = timed(batch, segments, *CLIP_WINDOW)
+            per_scalar = t_scalar / len(rows) * 1e9
+            per_batch = t_batch / len(segments) * 1e9
+            print(f"{workload:9s} {method:17s} scalar={per_scalar:8.1f} ns/seg "
+                  f"batch={per_batch:6.1f} ns/seg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Midpoint ellipse: lab5a float loop vs integer scalar vs batch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ellipse [--count 200]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.raster.ellipse import midpoint_ellipse, midpoint_ellipse_batch
+
+from .workloads import timed
+
+
+def lab5a_midpoint_ellipse(rx, ry, xc=0, yc=0):
+    # Nishan Gyawali/cglab5/lab5a.py, minus the plotting, as the baseline.
+    rx2 = rx * rx
+    ry2 = ry * ry
+    x = 0
+    y = ry
+    xes, yes = [], []
+
+    def plot_ellipse_points(x, y):
+        for px, py in ((x + xc, y + yc), (-x + xc, y + yc),
+                       (x + xc, -y + yc), (-x + xc, -y + yc)):
+            xes.append(px)
+            yes.append(py)
+
+    p1 = ry2 - rx2 * ry + 0.25 * rx2
+    plot_ellipse_points(x, y)
+    while 2 * ry2 * x <= 2 * rx2 * y:
+        x += 1
+        if p1 < 0:
+            p1 += 2 * ry2 * x + ry2
+        else:
+            y -= 1
+            p1 += 2 * ry2 * x - 2 * rx2 * y + ry2
+        plot_ellipse_points(x, y)
+    p2 = (ry2 * (x + 0.5)**2) + (rx2 * (y - 1)**2) - (rx2 * ry2)
+    while y >= 0:
+        y -= 1
+        if p2 > 0:
+            p2 += rx2 - 2 * rx2 * y
+        else:
+            x += 1
+            p2 += 2 * ry2 * x + rx2 - 2 * rx2 * y
+        plot_ellipse_points(x, y)
+    return xes, yes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200,
+                        help="ellipses per size class")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for limit in (10, 100, 1000, 10_000):
+        n = args.count
+        rows = np.column_stack([rng.integers(-limit, limit, (n, 2)),
+                                rng.integers(1, limit + 1, (n, 2))])
+        t_lab, _ = timed(lambda: [lab5a_midpoint_ellipse(rx, ry, xc, yc)
+                               for xc, yc, rx, ry in rows.tolist()])
+        t_int, _ = timed(lambda: [midpoint_ellipse(rx, ry, xc, yc)
+                               for xc, yc, rx, ry in rows.tolist()])
+        t_batch, _ = timed(midpoint_ellipse_batch, rows)
+        print(f"radii<={limit:<6d} ellipses={n:<5d} lab5a={t_lab:8.4f}s "
+              f"int-scalar={t_int:8.4f}s batch={t_batch:8.4f}s "
+              f"speedup={t_lab / t_batch:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
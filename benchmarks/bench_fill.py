@@ -0,0 +1,51 @@
+"""Scanline fill of large polygons into a framebuffer.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fill [--vertices 100000] [--polygons 1000]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.framebuffer import Framebuffer
+from cgv.raster.base import offsets_from_counts
+from cgv.raster.fill import RULES, fill_polygons
+
+from .workloads import timed
+
+
+def wavy_polygon(n, cx, cy, radius, waves):
+    a = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    r = radius * (1 + 0.2 * np.sin(a * waves))
+    return np.column_stack([cx + r * np.cos(a), cy + r * np.sin(a)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--vertices", type=int, default=100_000)
+    parser.add_argument("--polygons", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    half = args.size / 2
+    big = wavy_polygon(args.vertices, half, half, 0.8 * half, 500)
+    small = [rng.uniform(0, args.size, 2) + rng.uniform(-30, 30, (rng.integers(3, 20), 2))
+             for _ in range(args.polygons)]
+    scenes = {
+        f"1 polygon x {args.vertices} vertices": (big, [0, len(big)]),
+        f"{args.polygons} random polygons": (np.concatenate(small),
+                                             offsets_from_counts([len(p) for p in small])),
+    }
+
+    for name, (vertices, offsets) in scenes.items():
+        for rule in RULES:
+            fb = Framebuffer(args.size, args.size)
+            elapsed, spans = timed(fill_polygons, fb, vertices, offsets, (255, 255, 255), rule)
+            print(f"{name:32s} {rule:8s} spans={spans:>8d} {elapsed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
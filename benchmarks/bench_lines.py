@@ -0,0 +1,48 @@
+"""Scalar vs batch line rasterizers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lines [--segments 100000] [--size 200]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.raster.line import (bresenham, bresenham_batch, dda, dda_batch, dda_fixed,
+                             dda_fixed_batch)
+
+from .workloads import timed
+
+
+def same_pixels(scalar, xs, ys, offsets, segments):
+    for i, row in enumerate(segments.tolist()):
+        got = list(zip(xs[offsets[i]:offsets[i + 1]].tolist(),
+                       ys[offsets[i]:offsets[i + 1]].tolist()))
+        if got != scalar(*row):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    segments = rng.integers(-args.size, args.size, (args.segments, 4))
+
+    for name, scalar, batch in (("dda", dda, dda_batch),
+                                ("dda_fixed", dda_fixed, dda_fixed_batch),
+                                ("bresenham", bresenham, bresenham_batch)):
+        t_scalar, _ = timed(lambda: [scalar(*row) for row in segments.tolist()])
+        t_batch, (xs, ys, offsets) = timed(batch, segments)
+        ok = same_pixels(scalar, xs, ys, offsets, segments)
+        print(f"{name:10s} pixels={offsets[-1]:>10d} scalar={t_scalar:8.3f}s "
+              f"batch={t_batch:8.3f}s speedup={t_scalar / t_batch:6.1f}x "
+              f"identical={ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Memory and conversion cost of the pixel formats for a typical scene.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pixels [--lines 2000] [--circles 200]
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from cgv.raster.circle import midpoint_circle_batch
+from cgv.raster.line import bresenham_batch
+from cgv.raster.pixels import decode_spans, encode_spans, from_points, to_points
+
+from .workloads import timed
+
+
+def deep_size(obj):
+    # Container plus every element; small ints are shared and cost nothing.
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(deep_size(item) for item in obj)
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    return sys.getsizeof(obj)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--circles", type=int, default=200)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    segments = rng.integers(0, args.size, (args.lines, 4))
+    circles = np.column_stack([rng.integers(0, args.size, (args.circles, 2)),
+                               rng.integers(1, args.size // 4, args.circles)])
+    lxs, lys, loffsets = bresenham_batch(segments)
+    cxs, cys, _ = midpoint_circle_batch(circles)
+    xs = np.concatenate([lxs, cxs])
+    ys = np.concatenate([lys, cys])
+    n = len(xs)
+
+    points = list(zip(xs.tolist(), ys.tolist()))
+    lists = (xs.tolist(), ys.tolist())
+    t_pack, pixels = timed(from_points, points)
+    t_unpack, _ = timed(to_points, pixels)
+    t_encode, (spans, span_offsets) = timed(encode_spans, lxs, lys, loffsets)
+    t_decode, _ = timed(decode_spans, spans, span_offsets)
+    span_bytes = spans.nbytes + span_offsets.nbytes + cxs.size * pixels.itemsize
+
+    print(f"{n} pixels ({len(lxs)} from {args.lines} lines, {len(cxs)} from {args.circles} circles)")
+    for name, size in (("list of (x, y) tuples", deep_size(points)),
+                       ("x_points, y_points lists", deep_size(lists)),
+                       (f"structured {pixels.dtype.descr[0][1]}", pixels.nbytes),
+                       ("line spans + structured circles", span_bytes)):
+        print(f"{name:34s} {size / 2**20:8.2f} MB {size / n:7.1f} B/pixel")
+    print(f"from_points {t_pack * 1e3:.1f} ms, to_points {t_unpack * 1e3:.1f} ms, "
+          f"encode_spans {t_encode * 1e3:.1f} ms, decode_spans {t_decode * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Straight-line fast paths vs the general rasterizer when drawing.
+
+The scene is mostly rectangle edges, axes and 45-degree lines, with a
+share of general segments.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_straight [--segments 100000] [--general 0.1]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.framebuffer import Framebuffer
+from cgv.raster import get_rasterizer
+from cgv.raster.base import Rasterizer
+
+from .workloads import timed
+
+
+def scene(rng, n, size, general):
+    corner = rng.integers(0, size, (n, 2))
+    length = rng.integers(-size // 4, size // 4, n)
+    kind = rng.choice(4, n, p=[(1 - general) * 0.4, (1 - general) * 0.4,
+                              (1 - general) * 0.2, general])
+    step = np.array([[1, 0], [0, 1], [1, 1], [1, 0]])[kind] * length[:, None]
+    end = corner + step
+    end[kind == 3] = rng.integers(0, size, (int((kind == 3).sum()), 2))
+    return np.column_stack([corner, end])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--general", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    segments = scene(np.random.default_rng(args.seed), args.segments, args.size, args.general)
+    for name in ("dda", "dda_fixed", "bresenham"):
+        rasterizer = get_rasterizer(name)
+        times = []
+        buffers = []
+        for draw in (Rasterizer.draw, type(rasterizer).draw):
+            fb = Framebuffer(args.size, args.size)
+            times.append(timed(draw, rasterizer, fb, segments, (255, 255, 255))[0])
+            buffers.append(fb.data)
+        print(f"{name:10s} general={times[0] * 1e3:8.1f} ms fast paths={times[1] * 1e3:8.1f} ms "
+              f"speedup={times[0] / times[1]:5.1f}x identical={np.array_equal(*buffers)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Tiled multi-process rendering of a large line scene vs one draw call.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tiled [--lines 100000] [--workers 1 2 4 8]
+"""
+import argparse
+
+import numpy as np
+
+from cgv.framebuffer import Framebuffer
+from cgv.raster import get_rasterizer
+from cgv.raster.tiled import render_tiled
+
+from .workloads import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--length", type=int, default=60)
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--tile", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = rng.integers(0, args.size, (args.lines, 2))
+    segments = np.column_stack([start, start + rng.integers(-args.length, args.length + 1,
+                                                            (args.lines, 2))])
+
+    reference = Framebuffer(args.size, args.size)
+    single, _ = timed(get_rasterizer("bresenham").draw, reference, segments, (255, 255, 255))
+    print(f"one draw call      {single * 1e3:8.1f} ms")
+
+    for workers in args.workers:
+        # Start the worker pool outside the timing; it is reused afterwards.
+        render_tiled(Framebuffer(args.size, args.size), "bresenham", segments[:1], 255,
+                     args.tile, workers)
+        fb = Framebuffer(args.size, args.size)
+        elapsed, _ = timed(render_tiled, fb, "bresenham", segments, (255, 255, 255), args.tile,
+                           workers)
+        same = np.array_equal(fb.data, reference.data)
+        print(f"tiled, {workers} worker(s) {elapsed * 1e3:8.1f} ms "
+              f"x{single / elapsed:5.2f} identical={same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""pytest-benchmark suite for the line, circle, ellipse and clip algorithms.
+
+Run from the repository root and keep the JSON to compare commits:
+
+    pytest benchmarks --benchmark-json=bench.json
+    pytest benchmarks --benchmark-autosave          # then --benchmark-compare
+
+Nothing here opens a window or imports matplotlib.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from cgv.raster import get_rasterizer  # noqa: E402
+from cgv.raster.clip import CLIPPERS  # noqa: E402
+
+from . import workloads  # noqa: E402
+
+# The scalar backends get fewer primitives so one round stays short, so
+# results are grouped per backend: each group compares algorithms on the
+# same rows.
+SIZES = {"scalar": 200, "batch": 20_000}
+HUGE = {"scalar": 4, "batch": 64}
+
+LINE_CASES = [(name, kind) for name in ("dda", "dda_fixed", "bresenham") for kind in ("short", "long", "octants")]
+
+
+def run_rasterizer(benchmark, name, rows, backend):
+    rasterizer = get_rasterizer(name)
+    benchmark.extra_info.update(primitives=len(rows), backend=backend)
+    result = benchmark(rasterizer.rasterize, rows, backend)
+    if backend == "batch":
+        benchmark.extra_info["pixels"] = int(result[2][-1])
+    else:
+        benchmark.extra_info["pixels"] = sum(map(len, result))
+
+
+@pytest.mark.parametrize("backend", ["scalar", "batch"])
+@pytest.mark.parametrize("name, kind", LINE_CASES)
+def test_lines(benchmark, name, kind, backend):
+    benchmark.group = f"line-{kind}-{backend}"
+    n = SIZES[backend] // 10 if kind == "long" else SIZES[backend]
+    run_rasterizer(benchmark, name, workloads.lines(kind, n), backend)
+
+
+@pytest.mark.parametrize("backend", ["scalar", "batch"])
+@pytest.mark.parametrize("kind", ["small", "huge"])
+def test_midpoint_circle(benchmark, kind, backend):
+    benchmark.group = f"circle-{kind}-{backend}"
+    n = HUGE[backend] if kind == "huge" else SIZES[backend]
+    run_rasterizer(benchmark, "midpoint_circle", workloads.circles(kind, n), backend)
+
+
+@pytest.mark.parametrize("backend", ["scalar", "batch"])
+@pytest.mark.parametrize("kind", ["small", "huge"])
+def test_midpoint_ellipse(benchmark, kind, backend):
+    benchmark.group = f"ellipse-{kind}-{backend}"
+    n = HUGE[backend] if kind == "huge" else SIZES[backend]
+    run_rasterizer(benchmark, "midpoint_ellipse", workloads.ellipses(kind, n), backend)
+
+
+@pytest.mark.parametrize("backend", ["scalar", "batch"])
+@pytest.mark.parametrize("method", sorted(CLIPPERS))
+@pytest.mark.parametrize("kind", ["inside", "outside", "crossing"])
+def test_clip(benchmark, kind, method, backend):
+    benchmark.group = f"clip-{kind}-{backend}"
+    scalar, batch = CLIPPERS[method]
+    segments = workloads.clip_segments(kind, SIZES[backend] * 5)
+    benchmark.extra_info.update(primitives=len(segments), backend=backend)
+    if backend == "batch":
+        benchmark(batch, segments, *workloads.CLIP_WINDOW)
+    else:
+        rows = segments.tolist()
+        window = workloads.CLIP_WINDOW
+        benchmark(lambda: [scalar(*row, *window) for row in rows])
@@ -0,0 +1,71 @@
+"""Seeded workloads and a timer shared by the benchmarks.
+
+Every generator takes a ``seed`` so the same commit always benchmarks the
+same primitives and results can be compared across commits.
+"""
+import time
+
+import numpy as np
+
+CLIP_WINDOW = (10.0, 10.0, 100.0, 100.0)
+
+def timed(fn, *args, repeat=1):
+    """Best wall time in seconds of ``repeat`` calls of ``fn(*args)``, and
+    the result of the last call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# (sign of dx, sign of dy, steep) for the eight octants, steep meaning |dy| >= |dx|.
+OCTANTS = [(sx, sy, steep) for sx in (1, -1) for sy in (1, -1) for steep in (False, True)]
+
+
+def lines(kind, n, seed=0):
+    """(n, 4) int segments: ``short`` (<= 8 px), ``long`` (up to 2000 px)
+    or ``octants`` (n / 8 of medium length in each octant)."""
+    rng = np.random.default_rng(seed)
+    if kind == "octants":
+        per = -(-n // len(OCTANTS))
+        parts = []
+        for sx, sy, steep in OCTANTS:
+            major = rng.integers(1, 200, per)
+            minor = rng.integers(0, major + 1)
+            dx, dy = (minor, major) if steep else (major, minor)
+            start = rng.integers(-500, 500, (per, 2))
+            parts.append(np.column_stack([start, start + np.column_stack([sx * dx, sy * dy])]))
+        return np.concatenate(parts)[:n]
+    reach = {"short": 8, "long": 2000}[kind]
+    start = rng.integers(-1000, 1000, (n, 2))
+    return np.column_stack([start, start + rng.integers(-reach, reach + 1, (n, 2))])
+
+
+def circles(kind, n, seed=0):
+    """(n, 3) rows of ``xc, yc, r`` with ``small`` (1..16) or ``huge``
+    (1000..4000) radii."""
+    rng = np.random.default_rng(seed)
+    low, high = {"small": (1, 17), "huge": (1000, 4001)}[kind]
+    return np.column_stack([rng.integers(-500, 500, (n, 2)), rng.integers(low, high, n)])
+
+
+def ellipses(kind, n, seed=0):
+    """(n, 4) rows of ``xc, yc, rx, ry`` with ``small`` or ``huge`` radii."""
+    rng = np.random.default_rng(seed)
+    low, high = {"small": (1, 17), "huge": (1000, 4001)}[kind]
+    return np.column_stack([rng.integers(-500, 500, (n, 2)), rng.integers(low, high, (n, 2))])
+
+
+def clip_segments(kind, n, seed=0):
+    """(n, 4) float segments against ``CLIP_WINDOW`` that are all
+    ``inside``, all ``outside`` (trivial rejects) or all ``crossing``."""
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = CLIP_WINDOW
+    if kind == "inside":
+        return rng.uniform(xmin, xmax, (n, 4))
+    if kind == "outside":
+        return rng.uniform(xmax + 1, xmax + 100, (n, 4))
+    return np.concatenate([rng.uniform(xmin - 100, xmin - 1, (n, 2)),
+                           rng.uniform(xmax + 1, xmax + 100, (n, 2))], axis=1)
@@ -0,0 +1 @@
+"""Computer graphics helpers shared by the CGV-BEI lab scripts."""
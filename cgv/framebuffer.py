@@ -0,0 +1,214 @@
+"""NumPy-backed render target for the rasterizers.
+
+Pixel (x, y) lives at ``data[y, x]``. Exports flip rows by default so y
+grows upwards, matching the matplotlib plots the labs draw.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+MODES = {"L": 1, "RGB": 3, "RGBA": 4}
+
+
+class Framebuffer:
+    def __init__(self, width, height, mode="RGBA", background=0):
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}, expected one of {sorted(MODES)}")
+        self.width = int(width)
+        self.height = int(height)
+        self.mode = mode
+        self.data = np.empty((self.height, self.width, MODES[mode]), dtype=np.uint8)
+        self.clear(background)
+
+    @classmethod
+    def from_array(cls, data, mode="RGBA"):
+        """A Framebuffer drawing into an existing (height, width, channels)
+        uint8 array, e.g. one in shared memory or a tile of a larger
+        framebuffer, without copying it."""
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}, expected one of {sorted(MODES)}")
+        if data.dtype != np.uint8 or data.ndim != 3 or data.shape[2] != MODES[mode]:
+            raise ValueError(f"expected a (height, width, {MODES[mode]}) uint8 array "
+                             f"for mode {mode}, got {data.dtype} {data.shape}")
+        fb = cls.__new__(cls)
+        fb.height, fb.width = data.shape[:2]
+        fb.mode = mode
+        fb.data = data
+        return fb
+
+    @property
+    def channels(self):
+        return MODES[self.mode]
+
+    def color(self, value):
+        """Normalize an int or tuple to one uint8 value per channel."""
+        c = np.atleast_1d(np.asarray(value, dtype=np.uint8))
+        if c.size == 1:
+            c = np.repeat(c, self.channels)
+            if self.mode == "RGBA":
+                c[3] = 255
+        elif c.size == 3 and self.mode == "RGBA":
+            c = np.append(c, np.uint8(255))
+        elif c.size == 3 and self.mode == "L":
+            c = np.round(c @ np.array([0.299, 0.587, 0.114])).astype(np.uint8)[None]
+        if c.size != self.channels:
+            raise ValueError(f"color {value!r} does not fit mode {self.mode}")
+        return c
+
+    def clear(self, color=0):
+        self.data[...] = self.color(color)
+
+    def inside(self, xs, ys):
+        return (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+
+    def packed(self, color):
+        """An (H, W) view of ``data`` with one element per pixel where the
+        mode allows it (uint32 for RGBA, uint8 for L; RGB stays (H, W, 3)),
+        and ``color`` as a value for it, so a pixel write is one store."""
+        c = self.color(color)
+        if self.mode == "RGBA":
+            return self.data.view(np.uint32)[..., 0], c.view(np.uint32)[0]
+        if self.mode == "L":
+            return self.data[..., 0], c[0]
+        return self.data, c
+
+    def set_pixels(self, xs, ys, color=255):
+        """Write ``color`` to every (xs[i], ys[i]); off-screen pixels are dropped."""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        keep = self.inside(xs, ys)
+        if not keep.all():
+            xs = xs[keep]
+            ys = ys[keep]
+        view, value = self.packed(color)
+        if not self.data.flags.c_contiguous:
+            # A view into a larger buffer, e.g. a tile: flattening it would
+            # copy, so write through 2-D indices instead.
+            view[ys, xs] = value
+            return
+        # Flat indices into the contiguous buffer beat 2-D fancy indexing.
+        flat = ys.astype(np.int64) * self.width
+        flat += xs
+        view.reshape(self.width * self.height, -1)[flat] = value
+
+    def blend_pixels(self, xs, ys, coverage, color=255):
+        """Composite ``color`` over (xs[i], ys[i]) with opacity
+        ``coverage[i]`` (0..1) times the color's alpha, source-over.
+
+        Pixels listed more than once end up as if blended one after
+        another: with a single color that only depends on the product of
+        their transparencies, ``1 - coverage[i] * alpha``.
+        """
+        size = self.width * self.height
+        if 16 * len(xs) < size:
+            # Few pixels: fold the repeats over the touched pixels only
+            # rather than over a whole-framebuffer transparency.
+            flat, t = self._transparencies(xs, ys, coverage, color)
+            pixels, inverse = np.unique(flat, return_inverse=True)
+            transparency = np.ones(len(pixels), dtype=np.float32)
+            np.multiply.at(transparency, inverse, t)
+            self.composite(transparency, color, pixels)
+            return
+        transparency = np.ones(size, dtype=np.float32)
+        self.cover(transparency, xs, ys, coverage, color)
+        self.composite(transparency, color)
+
+    def _transparencies(self, xs, ys, coverage, color):
+        # Flat pixel index and 1 - coverage * alpha of the on-screen entries.
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        keep = self.inside(xs, ys)
+        t = np.clip(np.asarray(coverage, dtype=np.float32), 0, 1)
+        if not keep.all():
+            xs, ys, t = xs[keep], ys[keep], t[keep]
+        if self.mode == "RGBA":
+            t *= self.color(color)[3] / 255
+        np.subtract(1, t, out=t)
+        flat = ys.astype(np.int32 if self.width * self.height < 2**31 else np.int64)
+        flat *= self.width
+        flat += xs
+        return flat, t
+
+    def cover(self, transparency, xs, ys, coverage, color=255):
+        """Multiply ``1 - coverage[i] * alpha`` into ``transparency``, a flat
+        float32 array with one value per pixel that starts at 1, at
+        (xs[i], ys[i]); alpha is the color's in RGBA mode and 1 otherwise.
+        Off-screen pixels are dropped. Call it block by block and finish
+        with :meth:`composite` to blend a large pixel stream."""
+        flat, t = self._transparencies(xs, ys, coverage, color)
+        np.multiply.at(transparency, flat, t)
+
+    def composite(self, transparency, color=255, pixels=None):
+        """Blend ``color`` with opacity ``1 - transparency``:
+        new = old + (color - old) * (1 - t), and in RGBA mode alpha goes
+        towards 255, as in source-over. ``transparency`` holds one value
+        per flat index in ``pixels``, or without ``pixels`` one per pixel
+        of the framebuffer, of which only those below 1 are blended."""
+        if pixels is None:
+            pixels = np.flatnonzero(transparency < 1)
+            transparency = transparency[pixels]
+        target = self.color(color).astype(np.float32)
+        if self.mode == "RGBA":
+            target[3] = 255
+        opacity = np.subtract(1, transparency, dtype=np.float32)
+        # Gather and scatter through the packed view, one element per pixel
+        # where the mode allows it, as set_pixels does.
+        view = self.packed(color)[0]
+        if self.data.flags.c_contiguous:
+            view = view.reshape(self.width * self.height, -1)
+            if view.shape[1] == 1:
+                view = view[:, 0]
+        else:
+            # Not flattenable without a copy: index rows and columns.
+            pixels = np.divmod(pixels, self.width)
+        gathered = view[pixels]
+        old = gathered.view(np.uint8).reshape(len(transparency), self.channels)
+        new = np.empty_like(old)
+        # Channel by channel: numpy is much slower broadcasting over a
+        # last axis of 3 or 4 than running over contiguous columns.
+        for c in range(self.channels):
+            channel = old[:, c].astype(np.float32)
+            out = target[c] - channel
+            out *= opacity
+            out += channel
+            new[:, c] = np.rint(out, out=out)
+        view[pixels] = new.view(view.dtype).reshape(gathered.shape)
+
+    def get_pixels(self, xs, ys):
+        return self.data[np.asarray(ys), np.asarray(xs)]
+
+    def rows(self, flip=True):
+        return self.data[::-1] if flip else self.data
+
+    def save_ppm(self, path, flip=True):
+        """Write binary PPM (P6), or PGM (P5) for mode L. Alpha is dropped."""
+        pixels = self.rows(flip)
+        magic = b"P5" if self.mode == "L" else b"P6"
+        if self.mode == "RGBA":
+            pixels = pixels[..., :3]
+        with open(path, "wb") as f:
+            f.write(b"%s\n%d %d\n255\n" % (magic, self.width, self.height))
+            f.write(np.ascontiguousarray(pixels).tobytes())
+
+    def save_png(self, path, flip=True, level=6):
+        with open(path, "wb") as f:
+            f.write(self.png_bytes(flip, level))
+
+    def png_bytes(self, flip=True, level=6):
+        color_type = {"L": 0, "RGB": 2, "RGBA": 6}[self.mode]
+        raw = np.zeros((self.height, 1 + self.width * self.channels), dtype=np.uint8)
+        raw[:, 1:] = self.rows(flip).reshape(self.height, -1)
+
+        def chunk(tag, body):
+            return (struct.pack(">I", len(body)) + tag + body
+                    + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, color_type, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n"
+                + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+                + chunk(b"IEND", b""))
+
+    def __repr__(self):
+        return f"Framebuffer({self.width}, {self.height}, mode={self.mode!r})"
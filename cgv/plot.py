@@ -0,0 +1,13 @@
+import matplotlib.pyplot as plt
+
+
+def plot_pixels(xs, ys, ax=None, **kwargs):
+    """Scatter rasterized pixels in one call; returns the matplotlib Axes."""
+    if ax is None:
+        ax = plt.figure(figsize=(6, 6)).gca()
+    kwargs.setdefault("s", 8)
+    kwargs.setdefault("marker", "s")
+    ax.scatter(xs, ys, **kwargs)
+    ax.set_aspect("equal", adjustable="box")
+    ax.grid(True)
+    return ax
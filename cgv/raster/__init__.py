@@ -0,0 +1,113 @@
+"""Shared rasterization algorithms for the lab scripts.
+
+Submodules are imported on first use so ``import cgv.raster`` stays cheap;
+numpy is loaded with the first algorithm and matplotlib only when a plot
+is requested.
+"""
+import importlib
+import os
+
+_EXPORTS = {
+    "Rasterizer": "base",
+    "pack_points": "base",
+    "dda": "line",
+    "dda_batch": "line",
+    "bresenham": "line",
+    "bresenham_batch": "line",
+    "DDA": "line",
+    "dda_fixed": "line",
+    "dda_fixed_batch": "line",
+    "FixedDDA": "line",
+    "Bresenham": "line",
+    "midpoint_circle": "circle",
+    "midpoint_circle_batch": "circle",
+    "MidpointCircle": "circle",
+    "midpoint_ellipse": "ellipse",
+    "midpoint_ellipse_batch": "ellipse",
+    "MidpointEllipse": "ellipse",
+    "scanline_spans": "fill",
+    "fill_polygon": "fill",
+    "fill_polygons": "fill",
+    "INSIDE": "clip",
+    "LEFT": "clip",
+    "RIGHT": "clip",
+    "BOTTOM": "clip",
+    "TOP": "clip",
+    "find_code": "clip",
+    "find_codes": "clip",
+    "cohen_sutherland": "clip",
+    "cohen_sutherland_batch": "clip",
+    "liang_barsky": "clip",
+    "liang_barsky_batch": "clip",
+    "clip_line": "clip",
+    "clip_lines": "clip",
+    "sutherland_hodgman": "clip",
+    "clip_polygons": "clip",
+    "iter_dda": "stream",
+    "iter_bresenham": "stream",
+    "iter_midpoint_circle": "stream",
+    "iter_midpoint_ellipse": "stream",
+    "reblock": "stream",
+    "PIXEL16": "pixels",
+    "PIXEL32": "pixels",
+    "SPAN": "pixels",
+    "compact": "pixels",
+    "from_points": "pixels",
+    "to_points": "pixels",
+    "from_lists": "pixels",
+    "to_lists": "pixels",
+    "encode_spans": "pixels",
+    "decode_spans": "pixels",
+    "render_tiled": "tiled",
+    "polyline": "outline",
+    "polylines_batch": "outline",
+    "draw_polylines": "outline",
+    "rectangles": "outline",
+    "draw_rectangles": "outline",
+    "plot_polylines": "outline",
+    "wu_line": "antialias",
+    "wu_batch": "antialias",
+    "draw_wu": "antialias",
+    "plot_wu": "antialias",
+}
+
+_RASTERIZERS = {
+    "dda": ("line", "DDA"),
+    "dda_fixed": ("line", "FixedDDA"),
+    "bresenham": ("line", "Bresenham"),
+    "midpoint_circle": ("circle", "MidpointCircle"),
+    "midpoint_ellipse": ("ellipse", "MidpointEllipse"),
+}
+
+# Importing a submodule binds it as an attribute of this package, which
+# would shadow an export of the same name from then on.
+_CLASHES = set(_EXPORTS).intersection(os.path.splitext(name)[0] for name in os.listdir(__path__[0]))
+if _CLASHES:
+    raise ImportError(f"exports shadowed by submodules of {__name__}: {sorted(_CLASHES)}")
+
+__all__ = sorted(_EXPORTS) + ["get_rasterizer", "rasterizer_names"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
+
+
+def rasterizer_names():
+    return sorted(_RASTERIZERS)
+
+
+def get_rasterizer(name):
+    """Return the Rasterizer registered as ``name``, e.g. ``"bresenham"``."""
+    try:
+        module, cls = _RASTERIZERS[name]
+    except KeyError:
+        raise ValueError(f"unknown rasterizer {name!r}, expected one of "
+                         f"{rasterizer_names()}") from None
+    return getattr(importlib.import_module(f".{module}", __name__), cls)()
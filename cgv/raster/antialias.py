@@ -0,0 +1,172 @@
+"""Xiaolin Wu anti-aliased lines as pixels plus coverage weights.
+
+Each column along the major axis gets the two pixels straddling the ideal
+line, weighted by how close the line passes to each; the end columns are
+also scaled by how much of the column the segment covers. The line height
+at a column is computed as ``y0 + gradient * (x - x0)`` rather than by
+repeated addition, so the scalar and batch versions agree exactly.
+"""
+import math
+
+import numpy as np
+
+from .base import blocks, offsets_from_counts, positions
+
+
+def _fpart(v):
+    return v - math.floor(v)
+
+
+def wu_line(x0, y0, x1, y1):
+    """One segment as a list of (x, y, coverage), two pixels per column.
+
+    A zero-length segment is one column with full coverage, split
+    between the two pixels around ``y0``.
+    """
+    steep = abs(y1 - y0) > abs(x1 - x0)
+    if steep:
+        x0, y0, x1, y1 = y0, x0, y1, x1
+    if x0 > x1:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    dx = x1 - x0
+    gradient = (y1 - y0) / dx if dx else 0.0
+
+    first = math.floor(x0 + 0.5)
+    last = math.floor(x1 + 0.5)
+    gap0 = 1 - _fpart(x0 + 0.5)
+    gap1 = _fpart(x1 + 0.5)
+    start = y0 + gradient * (first - x0)
+
+    points = []
+    for k in range(last - first + 1):
+        if first == last:
+            gap = max(gap0 + gap1 - 1, 0.0) if dx else 1.0
+        elif k == 0:
+            gap = gap0
+        elif first + k == last:
+            gap = gap1
+        else:
+            gap = 1.0
+        y = start + gradient * k
+        base = math.floor(y)
+        frac = y - base
+        x = first + k
+        for py, weight in ((base, gap * (1 - frac)), (base + 1, gap * frac)):
+            points.append((py, x, weight) if steep else (x, py, weight))
+    return points
+
+
+def _wu_rows(steep, first, start, gradient, gap0, gap1, columns, xs, ys, coverage):
+    # Columns of a run of whole segments; each output array is viewed as
+    # (columns, 2) so the two pixels of a column are written side by side.
+    ends = offsets_from_counts(columns)
+    k = positions(columns, np.int32)
+    y = np.repeat(gradient, columns)
+    y *= k
+    y += np.repeat(start, columns)
+    base = np.floor(y)
+    y -= base
+
+    cov = coverage.reshape(-1, 2)
+    cov[:, 1] = y
+    np.subtract(1, y, out=cov[:, 0])
+    cov[ends[:-1]] *= gap0[:, None]
+    cov[ends[1:] - 1] *= gap1[:, None]
+
+    # Each column is (major, minor) and (major, minor + 1), swapped back
+    # to (x, y) for steep segments.
+    major = np.repeat(first.astype(np.int32), columns)
+    major += k
+    minor = base.astype(np.int32)
+    s = np.repeat(steep, columns)
+    xs2 = xs.reshape(-1, 2)
+    ys2 = ys.reshape(-1, 2)
+    swap = minor - major
+    swap *= s
+    np.add(major, swap, out=xs2[:, 0])
+    np.subtract(minor, swap, out=ys2[:, 0])
+    np.add(xs2[:, 0], s, out=xs2[:, 1])
+    np.add(ys2[:, 0], ~s, out=ys2[:, 1])
+
+
+def _wu_setup(segments):
+    # Per-segment parameters of _wu_rows, in its argument order.
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x0, y0, x1, y1 = seg.T
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+
+    # Normalize to a left-to-right walk along the major axis.
+    a0 = np.where(steep, y0, x0)
+    b0 = np.where(steep, x0, y0)
+    a1 = np.where(steep, y1, x1)
+    b1 = np.where(steep, x1, y1)
+    flip = a0 > a1
+    a0, a1 = np.where(flip, a1, a0), np.where(flip, a0, a1)
+    b0, b1 = np.where(flip, b1, b0), np.where(flip, b0, b1)
+    da = a1 - a0
+    gradient = np.divide(b1 - b0, da, out=np.zeros_like(da), where=da != 0)
+
+    first = np.floor(a0 + 0.5)
+    last = np.floor(a1 + 0.5)
+    gap0 = 1 - ((a0 + 0.5) - first)
+    gap1 = (a1 + 0.5) - last
+    start = b0 + gradient * (first - a0)
+    columns = (last - first + 1).astype(np.int64)
+    # A single column is scaled once, by the part of it the segment spans
+    # (all of it for a zero-length segment).
+    single = columns == 1
+    gap0[single] = np.where(da[single] != 0, np.maximum(gap0[single] + gap1[single] - 1, 0), 1)
+    gap1[single] = 1
+    return steep, first, start, gradient, gap0, gap1, columns
+
+
+def _wu_pixels(params, offsets, block):
+    xs = np.empty(offsets[-1], dtype=np.int32)
+    ys = np.empty(offsets[-1], dtype=np.int32)
+    coverage = np.empty(offsets[-1], dtype=np.float32)
+    for i, j in blocks(offsets, block):
+        lo, hi = offsets[i], offsets[j]
+        _wu_rows(*(p[i:j] for p in params), xs[lo:hi], ys[lo:hi], coverage[lo:hi])
+    return xs, ys, coverage
+
+
+def wu_batch(segments, block=32768):
+    """Rasterize an (N, 4) array of x0, y0, x1, y1 rows.
+
+    Returns int32 ``xs``, ``ys``, float32 ``coverage`` in [0, 1] and
+    ``offsets``; the pixels and weights match :func:`wu_line` in order.
+    """
+    params = _wu_setup(segments)
+    offsets = 2 * offsets_from_counts(params[-1])
+    return (*_wu_pixels(params, offsets, block), offsets)
+
+
+def draw_wu(framebuffer, segments, color=255, block=32768):
+    """Blend anti-aliased segments into ``framebuffer``; returns the pixel
+    offsets. The result equals ``blend_pixels`` on the :func:`wu_batch`
+    output. When the lines cover a good part of the framebuffer, each
+    block of pixels is folded into a per-pixel transparency while it is
+    still in cache, and the framebuffer is blended once at the end."""
+    params = _wu_setup(segments)
+    offsets = 2 * offsets_from_counts(params[-1])
+    if 16 * offsets[-1] < framebuffer.width * framebuffer.height:
+        framebuffer.blend_pixels(*_wu_pixels(params, offsets, block), color)
+        return offsets
+    transparency = np.ones(framebuffer.width * framebuffer.height, dtype=np.float32)
+    for i, j in blocks(offsets, block):
+        n = offsets[j] - offsets[i]
+        xs = np.empty(n, dtype=np.int32)
+        ys = np.empty(n, dtype=np.int32)
+        coverage = np.empty(n, dtype=np.float32)
+        _wu_rows(*(p[i:j] for p in params), xs, ys, coverage)
+        framebuffer.cover(transparency, xs, ys, coverage, color)
+    framebuffer.composite(transparency, color)
+    return offsets
+
+
+def plot_wu(segments, ax=None, **kwargs):
+    """Scatter the pixels with their coverage as per-point alpha."""
+    from ..plot import plot_pixels
+
+    xs, ys, coverage, _ = wu_batch(segments)
+    return plot_pixels(xs, ys, ax=ax, alpha=coverage, **kwargs)
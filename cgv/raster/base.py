@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def offsets_from_counts(counts):
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def positions(counts, dtype=np.int64):
+    """Position within its run for every element of a flat array of runs
+    of the given lengths, e.g. counts [2, 3] gives [0, 1, 0, 1, 2]."""
+    counts = np.asarray(counts)
+    starts = offsets_from_counts(counts)
+    k = np.arange(starts[-1], dtype=dtype)
+    k -= np.repeat(starts[:-1].astype(dtype), counts)
+    return k
+
+
+def runs(counts):
+    """Run id and position within the run for a flat array of runs of the
+    given lengths, e.g. counts [2, 3] gives ids [0, 0, 1, 1, 1] and
+    positions [0, 1, 0, 1, 2]."""
+    counts = np.asarray(counts)
+    return np.repeat(np.arange(len(counts)), counts), positions(counts)
+
+
+def blocks(offsets, block):
+    """Split primitives into consecutive groups of about ``block`` output
+    elements, given their ``offsets``; yields (i, j) so rows i..j-1 form a
+    group. A primitive longer than ``block`` gets a group of its own, so
+    batch loops keep their temporaries cache-sized."""
+    bounds = np.searchsorted(offsets, np.arange(0, offsets[-1], block), side="right") - 1
+    bounds = np.append(np.unique(bounds), len(offsets) - 1)
+    return zip(bounds[:-1].tolist(), bounds[1:].tolist())
+
+
+def pack_points(point_lists):
+    """Flatten per-primitive lists of (x, y) tuples into xs, ys, offsets."""
+    offsets = offsets_from_counts([len(points) for points in point_lists])
+    flat = np.array([p for points in point_lists for p in points], dtype=np.int32)
+    flat = flat.reshape(-1, 2)
+    return flat[:, 0].copy(), flat[:, 1].copy(), offsets
+
+
+class Rasterizer:
+    """One primitive with a scalar and a batch backend.
+
+    ``scalar(*row)`` rasterizes a single primitive and returns a list of
+    (x, y) tuples. ``batch(rows)`` takes an (N, len(columns)) array and
+    returns flat int32 ``xs``, ``ys`` and an ``offsets`` array of length
+    N + 1. Subclasses without a vectorized backend inherit a batch that
+    loops over ``scalar``. ``dtype`` is the type the rows are read as:
+    int64 unless the algorithm takes fractional coordinates.
+    """
+
+    name = None
+    columns = ()
+    dtype = np.int64
+
+    def scalar(self, *row):
+        raise NotImplementedError
+
+    def scalar_batch(self, rows):
+        """Rasterize ``rows`` one at a time through ``scalar``, packed like
+        ``batch``."""
+        rows = np.asarray(rows).reshape(-1, len(self.columns))
+        return pack_points([self.scalar(*row) for row in rows.tolist()])
+
+    def batch(self, rows):
+        return self.scalar_batch(rows)
+
+    def rasterize(self, rows, backend="batch"):
+        if backend == "batch":
+            return self.batch(rows)
+        if backend == "scalar":
+            return self.scalar_batch(rows)
+        raise ValueError(f"unknown backend {backend!r}, expected 'batch' or 'scalar'")
+
+    def draw(self, framebuffer, rows, color=255, backend="batch"):
+        """Rasterize ``rows`` straight into ``framebuffer`` in one bulk write."""
+        xs, ys, offsets = self.rasterize(rows, backend)
+        framebuffer.set_pixels(xs, ys, color)
+        return offsets
+
+    def plot(self, rows, ax=None, backend="batch", **kwargs):
+        from ..plot import plot_pixels
+
+        xs, ys, _ = self.rasterize(rows, backend)
+        return plot_pixels(xs, ys, ax=ax, label=kwargs.pop("label", self.name), **kwargs)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
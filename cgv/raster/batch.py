@@ -0,0 +1,186 @@
+"""Rasterize primitives from a file or stdin without prompts or windows.
+
+The lab scripts ask for one coordinate at a time with ``input()``. This
+reads rows (``x0, y0, x1, y1`` for lines, ``xc, yc, r`` for circles,
+``xc, yc, rx, ry`` for ellipses) from CSV, whitespace-separated text or
+``.npy``, rasterizes ``--chunk`` rows at a time with the batch backend and
+streams the pixels out, so memory stays bounded by the chunk size
+whatever the input size. The DDA rasterizers take fractional
+coordinates; the others reject them rather than truncate them.
+
+Run from the repository root:
+
+    python -m cgv.raster.batch bresenham segments.csv -o pixels.npy
+    python -m cgv.raster.batch dda segments.npy -o pixels.csv
+    cat segments.csv | python -m cgv.raster.batch dda - --image out.png
+
+Pixel output is one ``primitive, x, y`` row per pixel: CSV text for
+``.csv`` or ``-`` (stdout), an (N, 3) int64 array for ``.npy``. ``--image``
+draws into a Framebuffer and saves a PNG or PPM instead.
+"""
+import argparse
+import io
+import itertools
+import sys
+
+import numpy as np
+
+from . import get_rasterizer, rasterizer_names
+
+
+def _as_rows(rows, dtype):
+    # Integer rasterizers get their rows unchanged or not at all: a float
+    # that is not a whole number is an error, not a truncation.
+    if np.issubdtype(dtype, np.integer) and rows.dtype.kind == "f":
+        bad = ~(np.isfinite(rows) & (rows == np.trunc(rows)))
+        if bad.any():
+            raise ValueError(f"{rows[bad][0]} is not an integer; this rasterizer "
+                             f"takes integer coordinates")
+    return np.asarray(rows, dtype=dtype)
+
+
+def _text_chunks(lines, columns, chunk, dtype):
+    # Commas and blank/comment/header lines are handled here so np.loadtxt
+    # only ever sees whitespace-separated numbers.
+    lines = (line.replace(",", " ") for line in lines)
+    lines = (line for line in lines if line.strip() and not line.lstrip().startswith("#"))
+    first = next(lines, None)
+    if first is None:
+        return
+    try:
+        [float(v) for v in first.split()]
+    except ValueError:
+        first = None                        # header line
+    if first is not None:
+        lines = itertools.chain([first], lines)
+    while True:
+        block = list(itertools.islice(lines, chunk))
+        if not block:
+            return
+        rows = np.loadtxt(block, dtype=np.float64, ndmin=2)
+        if rows.shape[1] != columns:
+            raise ValueError(f"expected {columns} values per row, got {rows.shape[1]}")
+        yield _as_rows(rows, dtype)
+
+
+def read_chunks(source, columns, chunk=8192, dtype=np.int64):
+    """Yield (n, columns) ``dtype`` blocks of at most ``chunk`` rows from a
+    ``.npy`` path (memory-mapped), a text path, ``"-"`` for stdin or an
+    open text file. Non-integer values are an error for an integer
+    ``dtype``."""
+    if source == "-":
+        yield from _text_chunks(sys.stdin, columns, chunk, dtype)
+    elif isinstance(source, io.IOBase):
+        yield from _text_chunks(source, columns, chunk, dtype)
+    elif str(source).endswith(".npy"):
+        rows = np.load(source, mmap_mode="r")
+        if rows.ndim != 2 or rows.shape[1] != columns:
+            raise ValueError(f"{source}: expected an (N, {columns}) array, got shape {rows.shape}")
+        for start in range(0, len(rows), chunk):
+            yield _as_rows(np.asarray(rows[start:start + chunk]), dtype)
+    else:
+        with open(source) as f:
+            yield from _text_chunks(f, columns, chunk, dtype)
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, "w")
+
+    def write(self, primitive, xs, ys):
+        np.savetxt(self.file, np.column_stack([primitive, xs, ys]), fmt="%d", delimiter=",")
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class NpyWriter:
+    # The length is unknown until the end, so the header is written with a
+    # placeholder and rewritten on close. Headers are padded to 64 bytes,
+    # so any row count fits in the same space.
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.count = 0
+        self._header(2 ** 62)
+
+    def _header(self, count):
+        np.lib.format.write_array_header_1_0(
+            self.file, {"descr": "<i8", "fortran_order": False, "shape": (count, 3)})
+
+    def write(self, primitive, xs, ys):
+        self.file.write(np.column_stack([primitive, xs, ys]).astype("<i8").tobytes())
+        self.count += len(xs)
+
+    def close(self):
+        self.file.seek(0)
+        self._header(self.count)
+        self.file.close()
+
+
+class ImageWriter:
+    def __init__(self, path, width, height, color=255):
+        from ..framebuffer import Framebuffer
+
+        self.path = path
+        self.color = color
+        self.framebuffer = Framebuffer(width, height)
+
+    def write(self, primitive, xs, ys):
+        self.framebuffer.set_pixels(xs, ys, self.color)
+
+    def close(self):
+        if self.path.endswith(".ppm"):
+            self.framebuffer.save_ppm(self.path)
+        else:
+            self.framebuffer.save_png(self.path)
+
+
+def writer_for(output=None, image=None, size=(800, 600)):
+    if image:
+        return ImageWriter(image, *size)
+    if output and output.endswith(".npy"):
+        return NpyWriter(output)
+    return CsvWriter(output or "-")
+
+
+def rasterize_stream(name, chunks, writer):
+    """Rasterize every block from ``chunks`` and hand the pixels to
+    ``writer`` tagged with their global primitive index. Returns
+    ``(primitives, pixels)`` counts."""
+    rasterizer = get_rasterizer(name)
+    primitives = pixels = 0
+    for rows in chunks:
+        xs, ys, offsets = rasterizer.batch(rows)
+        primitive = np.repeat(np.arange(primitives, primitives + len(rows)), np.diff(offsets))
+        writer.write(primitive, xs, ys)
+        primitives += len(rows)
+        pixels += len(xs)
+    return primitives, pixels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rasterizer", choices=rasterizer_names())
+    parser.add_argument("input", help="CSV/text file, .npy file or - for stdin")
+    parser.add_argument("-o", "--output", help=".csv, .npy or - for stdout (default)")
+    parser.add_argument("--image", help="draw into a PNG/PPM instead of listing pixels")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 600), metavar=("W", "H"))
+    parser.add_argument("--chunk", type=int, default=8192, help="rows per block")
+    args = parser.parse_args(argv)
+
+    rasterizer = get_rasterizer(args.rasterizer)
+    chunks = read_chunks(args.input, len(rasterizer.columns), args.chunk, rasterizer.dtype)
+    writer = writer_for(args.output, args.image, args.size)
+    try:
+        primitives, pixels = rasterize_stream(args.rasterizer, chunks, writer)
+    except ValueError as exc:
+        parser.error(f"{args.input}: {exc}")
+    finally:
+        writer.close()
+    print(f"{args.rasterizer}: {primitives} primitives, {pixels} pixels", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
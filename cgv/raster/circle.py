@@ -0,0 +1,103 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .base import Rasterizer, offsets_from_counts
+
+# The eight reflections of an octant point (x, y), in the order the lab
+# version emitted them: (x, y), (-x, y), (x, -y), (-x, -y), (y, x), ...
+_MIRRORS = ((1, 1, False), (-1, 1, False), (1, -1, False), (-1, -1, False),
+            (1, 1, True), (-1, 1, True), (1, -1, True), (-1, -1, True))
+
+
+def _octant(radius):
+    if radius < 0:
+        raise ValueError(f"radius must be non-negative, got {radius}")
+    x = radius
+    y = 0
+    points = [(x, y)]
+    P = 1 - radius
+    while x > y:
+        y += 1
+        if P <= 0:
+            P = P + 2*y + 1
+        else:
+            x -= 1
+            P = P + 2*y - 2*x + 1
+        points.append((x, y))
+    return points
+
+
+def midpoint_circle(radius, xc=0, yc=0):
+    # Mirroring the octant repeats the axis and diagonal pixels; keep the
+    # first copy of each.
+    points = {}
+    for x, y in _octant(radius):
+        for sx, sy, swap in _MIRRORS:
+            px, py = (y, x) if swap else (x, y)
+            points[(sx * px + xc, sy * py + yc)] = None
+    return list(points)
+
+
+@lru_cache(maxsize=1024)
+def circle_offsets(radius):
+    """Pixel offsets of a circle around the origin, cached per radius.
+
+    Returns read-only int32 arrays ``dx, dy`` in the same order as
+    :func:`midpoint_circle`.
+    """
+    octant = np.array(_octant(radius), dtype=np.int64)
+    x, y = octant[:, 0, None], octant[:, 1, None]
+    sx, sy, swap = (np.array(col) for col in zip(*_MIRRORS))
+    dx = (sx * np.where(swap, y, x)).ravel()
+    dy = (sy * np.where(swap, x, y)).ravel()
+
+    side = 2 * radius + 1
+    _, first = np.unique((dx + radius) * side + (dy + radius), return_index=True)
+    first.sort()
+    dx = dx[first].astype(np.int32)
+    dy = dy[first].astype(np.int32)
+    dx.flags.writeable = False
+    dy.flags.writeable = False
+    return dx, dy
+
+
+def midpoint_circle_batch(circles):
+    """Rasterize an (N, 3) array of xc, yc, radius rows.
+
+    The octant is computed once per distinct radius (and cached across
+    calls); every circle is then a translated copy of its radius' table.
+    Returns ``xs``, ``ys`` and ``offsets`` like the line batch functions.
+    """
+    circles = np.asarray(circles, dtype=np.int64).reshape(-1, 3)
+    xc, yc, r = circles.T
+    radii, which = np.unique(r, return_inverse=True)
+    tables = [circle_offsets(int(radius)) for radius in radii]
+
+    sizes = np.array([len(dx) for dx, _ in tables], dtype=np.int64)
+    counts = sizes[which]
+    offsets = offsets_from_counts(counts)
+    if len(circles) == 0:
+        return np.empty(0, np.int32), np.empty(0, np.int32), offsets
+
+    table_dx = np.concatenate([dx for dx, _ in tables])
+    table_dy = np.concatenate([dy for _, dy in tables])
+    table_start = offsets_from_counts(sizes)[:-1]
+    index = np.arange(offsets[-1]) + np.repeat(table_start[which] - offsets[:-1], counts)
+
+    xs = table_dx[index]
+    xs += np.repeat(xc, counts).astype(np.int32)
+    ys = table_dy[index]
+    ys += np.repeat(yc, counts).astype(np.int32)
+    return xs, ys, offsets
+
+
+class MidpointCircle(Rasterizer):
+    name = "midpoint_circle"
+    columns = ("xc", "yc", "radius")
+
+    def scalar(self, xc, yc, radius):
+        return midpoint_circle(radius, xc, yc)
+
+    def batch(self, rows):
+        return midpoint_circle_batch(rows)
@@ -0,0 +1,286 @@
+import numpy as np
+
+from .base import offsets_from_counts, runs
+
+INSIDE = 0
+LEFT = 1
+RIGHT = 2
+BOTTOM = 4
+TOP = 8
+
+
+def find_code(x, y, xmin, ymin, xmax, ymax):
+    code = INSIDE
+    if x < xmin:
+        code |= LEFT
+    elif x > xmax:
+        code |= RIGHT
+    if y < ymin:
+        code |= BOTTOM
+    elif y > ymax:
+        code |= TOP
+    return code
+
+
+def cohen_sutherland(x1, y1, x2, y2, xmin, ymin, xmax, ymax):
+    code1 = find_code(x1, y1, xmin, ymin, xmax, ymax)
+    code2 = find_code(x2, y2, xmin, ymin, xmax, ymax)
+
+    while True:
+        if code1 == 0 and code2 == 0:
+            return x1, y1, x2, y2
+
+        elif (code1 & code2) != 0:
+            return None
+
+        else:
+            if code1 != 0:
+                code_out = code1
+            else:
+                code_out = code2
+
+            if code_out & TOP:
+                x = x1 + (x2 - x1) * (ymax - y1) / (y2 - y1)
+                y = ymax
+            elif code_out & BOTTOM:
+                x = x1 + (x2 - x1) * (ymin - y1) / (y2 - y1)
+                y = ymin
+            elif code_out & RIGHT:
+                y = y1 + (y2 - y1) * (xmax - x1) / (x2 - x1)
+                x = xmax
+            elif code_out & LEFT:
+                y = y1 + (y2 - y1) * (xmin - x1) / (x2 - x1)
+                x = xmin
+
+            if code_out == code1:
+                x1, y1 = x, y
+                code1 = find_code(x1, y1, xmin, ymin, xmax, ymax)
+            else:
+                x2, y2 = x, y
+                code2 = find_code(x2, y2, xmin, ymin, xmax, ymax)
+
+
+def find_codes(x, y, xmin, ymin, xmax, ymax):
+    """Array version of :func:`find_code`."""
+    left = x < xmin
+    code = left * np.int8(LEFT)
+    code |= ((x > xmax) & ~left) * np.int8(RIGHT)
+    bottom = y < ymin
+    code |= bottom * np.int8(BOTTOM)
+    code |= ((y > ymax) & ~bottom) * np.int8(TOP)
+    return code
+
+
+def cohen_sutherland_batch(segments, xmin, ymin, xmax, ymax):
+    """Clip an (N, 4) array of x1, y1, x2, y2 rows against the window.
+
+    Returns ``(clipped, accepted)``: an (N, 4) float array and a boolean
+    mask. Rows that are rejected are NaN. Accepted rows equal what
+    :func:`cohen_sutherland` returns for the same segment.
+    """
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    clipped = np.full(seg.shape, np.nan)
+    accepted = np.zeros(len(seg), dtype=bool)
+
+    # Each pass settles the trivially accepted/rejected segments and moves
+    # one outside endpoint of every other segment onto a window edge. The
+    # working arrays are compacted every pass, so later passes only touch
+    # the shrinking remainder.
+    index = np.arange(len(seg))
+    points = np.ascontiguousarray(seg.T)
+    codes = np.stack([find_codes(points[0], points[1], xmin, ymin, xmax, ymax),
+                      find_codes(points[2], points[3], xmin, ymin, xmax, ymax)])
+    while index.size:
+        inside = (codes[0] | codes[1]) == 0
+        done = index[inside]
+        accepted[done] = True
+        clipped[done] = points[:, inside].T
+
+        pending = ~inside & ((codes[0] & codes[1]) == 0)
+        index, points, codes = index[pending], points[:, pending], codes[:, pending]
+        if not index.size:
+            break
+
+        x1, y1, x2, y2 = points
+        first = codes[0] != 0
+        code_out = np.where(first, codes[0], codes[1])
+        # TOP and BOTTOM take priority over RIGHT and LEFT, as in the
+        # scalar if/elif chain.
+        top = (code_out & TOP) != 0
+        horizontal = top | ((code_out & BOTTOM) != 0)
+        edge_y = np.where(top, ymax, ymin)
+        edge_x = np.where((code_out & RIGHT) != 0, xmax, xmin)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(horizontal, x1 + (x2 - x1) * (edge_y - y1) / (y2 - y1), edge_x)
+            y = np.where(horizontal, edge_y, y1 + (y2 - y1) * (edge_x - x1) / (x2 - x1))
+        code = find_codes(x, y, xmin, ymin, xmax, ymax)
+
+        # Move endpoint 1 where it was outside, otherwise endpoint 2.
+        second = ~first
+        points[0, first], points[1, first], codes[0, first] = x[first], y[first], code[first]
+        points[2, second], points[3, second], codes[1, second] = x[second], y[second], code[second]
+
+    return clipped, accepted
+
+
+def liang_barsky(x1, y1, x2, y2, xmin, ymin, xmax, ymax):
+    dx = x2 - x1
+    dy = y2 - y1
+    t0, t1 = 0.0, 1.0
+
+    # One pass over the four edges; p < 0 means the segment enters the
+    # window across that edge, p > 0 means it leaves.
+    for p, q in ((-dx, x1 - xmin), (dx, xmax - x1), (-dy, y1 - ymin), (dy, ymax - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+        if t0 > t1:
+            return None
+
+    return x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy
+
+
+def liang_barsky_batch(segments, xmin, ymin, xmax, ymax):
+    """Array version of :func:`liang_barsky`, returning ``(clipped, accepted)``
+    like :func:`cohen_sutherland_batch`."""
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = seg.T
+    dx = x2 - x1
+    dy = y2 - y1
+    p = np.stack([-dx, dx, -dy, dy])
+    q = np.stack([x1 - xmin, xmax - x1, y1 - ymin, ymax - y1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = q / p
+    t0 = np.max(np.where(p < 0, t, 0.0), axis=0, initial=0.0)
+    t1 = np.min(np.where(p > 0, t, 1.0), axis=0, initial=1.0)
+    accepted = ~((p == 0) & (q < 0)).any(axis=0) & (t0 <= t1)
+
+    clipped = np.column_stack([x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy])
+    clipped[~accepted] = np.nan
+    return clipped, accepted
+
+
+def _edge_intersection(edge, sx, sy, ex, ey, xmin, ymin, xmax, ymax):
+    # Where the polygon edge s -> e crosses the given window edge.
+    if edge & (LEFT | RIGHT):
+        x = xmin if edge == LEFT else xmax
+        return x, sy + (ey - sy) * (x - sx) / (ex - sx)
+    y = ymin if edge == BOTTOM else ymax
+    return sx + (ex - sx) * (y - sy) / (ey - sy), y
+
+
+def sutherland_hodgman(points, xmin, ymin, xmax, ymax):
+    """Clip a polygon given as a list of (x, y) vertices; returns the
+    clipped vertex list, empty if nothing is left."""
+    output = list(points)
+    for edge in (LEFT, RIGHT, BOTTOM, TOP):
+        polygon, output = output, []
+        if not polygon:
+            break
+        s = polygon[-1]
+        s_in = not find_code(*s, xmin, ymin, xmax, ymax) & edge
+        for e in polygon:
+            e_in = not find_code(*e, xmin, ymin, xmax, ymax) & edge
+            if e_in != s_in:
+                output.append(_edge_intersection(edge, *s, *e, xmin, ymin, xmax, ymax))
+            if e_in:
+                output.append(e)
+            s, s_in = e, e_in
+    return output
+
+
+def _clip_polygon_edge(vertices, counts, edge, window):
+    # One Sutherland-Hodgman pass over every polygon at once. Each vertex
+    # e emits the crossing of its incoming edge s -> e (if any), then
+    # itself if it is inside.
+    poly, _ = runs(counts)
+    starts = offsets_from_counts(counts)[:-1]
+    prev = np.arange(len(vertices)) - 1
+    first = starts[counts > 0]
+    prev[first] = first + counts[counts > 0] - 1
+
+    ex, ey = vertices.T
+    inside = (find_codes(ex, ey, *window) & edge) == 0
+    crossing = inside != inside[prev]
+    emitted = crossing.astype(np.int64) + inside
+
+    out = np.empty((int(emitted.sum()), 2))
+    at = np.cumsum(emitted) - emitted
+    s = vertices[prev[crossing]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ix, iy = _edge_intersection(edge, s[:, 0], s[:, 1], ex[crossing], ey[crossing], *window)
+    out[at[crossing], 0] = ix
+    out[at[crossing], 1] = iy
+    out[(at + crossing)[inside]] = vertices[inside]
+    return out, np.bincount(poly, weights=emitted, minlength=len(counts)).astype(np.int64)
+
+
+def clip_polygons(vertices, offsets, xmin, ymin, xmax, ymax):
+    """Clip many polygons with Sutherland-Hodgman.
+
+    Polygons are stored as an (M, 2) vertex array plus an ``offsets``
+    array of length P + 1, polygon i being ``vertices[offsets[i]:offsets[i + 1]]``.
+    Returns the clipped polygons in the same layout (empty where rejected).
+    Polygons whose bounding box is inside the window are passed through and
+    those whose box lies beyond one window edge are dropped, both decided
+    by the outcodes of the box corners; only the rest are clipped per edge.
+    """
+    window = (xmin, ymin, xmax, ymax)
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    poly, k = runs(counts)
+
+    nonempty = counts > 0
+    low = np.zeros((len(counts), 2))
+    high = np.zeros((len(counts), 2))
+    low[nonempty] = np.minimum.reduceat(vertices, offsets[:-1][nonempty])
+    high[nonempty] = np.maximum.reduceat(vertices, offsets[:-1][nonempty])
+    code_low = find_codes(low[:, 0], low[:, 1], *window)
+    code_high = find_codes(high[:, 0], high[:, 1], *window)
+    accept = nonempty & ((code_low | code_high) == 0)
+    clip = nonempty & ~accept & ((code_low & code_high) == 0)
+
+    clipped = vertices[clip[poly]]
+    clipped_counts = counts[clip]
+    for edge in (LEFT, RIGHT, BOTTOM, TOP):
+        clipped, clipped_counts = _clip_polygon_edge(clipped, clipped_counts, edge, window)
+
+    out_counts = np.where(accept, counts, 0)
+    out_counts[clip] = clipped_counts
+    out_offsets = offsets_from_counts(out_counts)
+    out = np.empty((out_offsets[-1], 2))
+    kept = accept[poly]
+    out[out_offsets[poly[kept]] + k[kept]] = vertices[kept]
+    which, k = runs(clipped_counts)
+    out[out_offsets[np.flatnonzero(clip)[which]] + k] = clipped
+    return out, out_offsets
+
+
+CLIPPERS = {
+    "cohen_sutherland": (cohen_sutherland, cohen_sutherland_batch),
+    "liang_barsky": (liang_barsky, liang_barsky_batch),
+}
+
+
+def _clipper(method):
+    try:
+        return CLIPPERS[method]
+    except KeyError:
+        raise ValueError(f"unknown clipping method {method!r}, expected one of "
+                         f"{sorted(CLIPPERS)}") from None
+
+
+def clip_line(x1, y1, x2, y2, xmin, ymin, xmax, ymax, method="cohen_sutherland"):
+    """Clip one segment; returns (x1, y1, x2, y2) or None if it is outside."""
+    return _clipper(method)[0](x1, y1, x2, y2, xmin, ymin, xmax, ymax)
+
+
+def clip_lines(segments, xmin, ymin, xmax, ymax, method="cohen_sutherland"):
+    """Clip an (N, 4) array of segments; returns ``(clipped, accepted)``."""
+    return _clipper(method)[1](segments, xmin, ymin, xmax, ymax)
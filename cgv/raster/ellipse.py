@@ -0,0 +1,163 @@
+import numpy as np
+
+from .base import Rasterizer, offsets_from_counts, runs
+
+# Decision variables below are the lab's float ones scaled by 4, which
+# keeps them integral; the largest term is about 4 * rx^2 * ry^2.
+MAX_RADIUS = 2**15
+
+
+def _ellipse_points(xc, yc, x, y, points):
+    points.extend([
+        ( x + xc,  y + yc),
+        (-x + xc,  y + yc),
+        ( x + xc, -y + yc),
+        (-x + xc, -y + yc),
+    ])
+
+
+def midpoint_ellipse(rx, ry, xc=0, yc=0, regions=False):
+    """Midpoint ellipse as a list of (x, y), four mirrored points per step.
+
+    With ``regions=True`` also returns a parallel list holding 1 or 2 for
+    the region each point was produced in.
+    """
+    if rx <= 0 or ry <= 0:
+        raise ValueError(f"radii must be positive, got rx={rx}, ry={ry}")
+    rx2 = rx * rx
+    ry2 = ry * ry
+
+    x = 0
+    y = ry
+
+    points = []
+
+    # Region 1 decision parameter, 4 * (ry2 - rx2 * ry + rx2 / 4)
+    p1 = 4 * ry2 - 4 * rx2 * ry + rx2
+    _ellipse_points(xc, yc, x, y, points)
+
+    while ry2 * x <= rx2 * y:
+        x += 1
+        if p1 < 0:
+            p1 += 8 * ry2 * x + 4 * ry2
+        else:
+            y -= 1
+            p1 += 8 * ry2 * x - 8 * rx2 * y + 4 * ry2
+        _ellipse_points(xc, yc, x, y, points)
+    region1 = len(points)
+
+    # Region 2 decision parameter, 4 * f(x + 1/2, y - 1)
+    p2 = ry2 * (2 * x + 1)**2 + 4 * rx2 * (y - 1)**2 - 4 * rx2 * ry2
+
+    # Stop on the x axis; the lab version ran one row past it to y = -1.
+    while y > 0:
+        y -= 1
+        if p2 > 0:
+            p2 += 4 * rx2 - 8 * rx2 * y
+        else:
+            x += 1
+            p2 += 8 * ry2 * x + 4 * rx2 - 8 * rx2 * y
+        _ellipse_points(xc, yc, x, y, points)
+
+    if regions:
+        return points, [1] * region1 + [2] * (len(points) - region1)
+    return points
+
+
+def _least(lhs, rhs):
+    # Smallest n >= 0 with lhs * (2n + 1)^2 >= rhs: a float estimate fixed
+    # up with exact integer comparisons.
+    n = np.ceil((np.sqrt(np.maximum(rhs, 0) / lhs) - 1) / 2).astype(np.int64)
+    np.maximum(n, 0, out=n)
+    for _ in range(2):
+        n += lhs * (2 * n + 1)**2 < rhs
+        n -= (n > 0) & (lhs * (2 * n - 1)**2 >= rhs)
+    return n
+
+
+def midpoint_ellipse_batch(ellipses, regions=False):
+    """Rasterize an (N, 4) array of xc, yc, rx, ry rows.
+
+    Returns ``xs``, ``ys`` and ``offsets`` like the line batch functions,
+    with the same points in the same order as :func:`midpoint_ellipse`.
+    With ``regions=True`` a fourth boolean array marks region-1 points.
+
+    Instead of stepping the decision variable, each column (region 1) or
+    row (region 2) solves for its nearest pixel directly; the scalar
+    loop's limit of one pixel per step then becomes a running max/min.
+    """
+    ellipses = np.asarray(ellipses, dtype=np.int64).reshape(-1, 4)
+    xc, yc, rx, ry = ellipses.T
+    if len(ellipses) and (min(rx.min(), ry.min()) <= 0
+                          or max(rx.max(), ry.max()) >= MAX_RADIUS):
+        raise ValueError(f"radii must be in [1, {MAX_RADIUS})")
+    rx2 = rx * rx
+    ry2 = ry * ry
+    # Shifting each segment by seg * span makes one accumulate over the
+    # flat array restart at every segment boundary. Region-2 values lie in
+    # [-ry, rx], so span must exceed one ellipse's rx plus the previous
+    # one's ry.
+    span = int(rx.max(initial=0) + ry.max(initial=0)) + 1
+
+    # Region 1, columns x = 0..rx (the scalar loop never gets past rx):
+    # y = max(nearest(x), previous y - 1).
+    seg, x = runs(rx + 1)
+    a2, b2 = rx2[seg], ry2[seg]
+    y = _least(a2, 4 * b2 * (a2 - x * x)) + x
+    y += seg * span
+    np.maximum.accumulate(y, out=y)
+    y -= seg * span + x
+
+    x_end = rx.copy()
+    done = np.flatnonzero(b2 * x > a2 * y)
+    ends, first = np.unique(seg[done], return_index=True)
+    x_end[ends] = x[done[first]]
+    keep = x <= x_end[seg]
+    seg1, x1, y1 = seg[keep], x[keep], y[keep]
+    y_end = y1[offsets_from_counts(x_end + 1)[1:] - 1]
+
+    # Region 2, rows y_end - 1 down to 0:
+    # x = min(max(nearest(y), x_end) - i over the run so far, x_end) + i.
+    seg2, i = runs(y_end)
+    i += 1
+    a2, b2, start = rx2[seg2], ry2[seg2], x_end[seg2]
+    y2 = y_end[seg2] - i
+    x2 = np.maximum(_least(b2, 4 * a2 * (b2 - y2 * y2) + 1), start) - i
+    x2 -= seg2 * span
+    np.minimum.accumulate(x2, out=x2)
+    x2 += seg2 * span
+    x2 = np.minimum(x2, start) + i
+
+    # Each ellipse is its region-1 run followed by its region-2 run, and
+    # every quadrant point expands to four mirrored pixels.
+    n1, n2 = x_end + 1, y_end
+    quad = offsets_from_counts(n1 + n2)
+    pos1 = quad[seg1] + np.arange(len(seg1)) - offsets_from_counts(n1)[seg1]
+    pos2 = quad[seg2] + n1[seg2] + i - 1
+    qx = np.empty(quad[-1], dtype=np.int64)
+    qy = np.empty(quad[-1], dtype=np.int64)
+    qx[pos1], qy[pos1] = x1, y1
+    qx[pos2], qy[pos2] = x2, y2
+
+    n = n1 + n2
+    xs = np.repeat(xc, n)[:, None] + qx[:, None] * np.array([1, -1, 1, -1])
+    ys = np.repeat(yc, n)[:, None] + qy[:, None] * np.array([1, 1, -1, -1])
+    xs = xs.astype(np.int32).ravel()
+    ys = ys.astype(np.int32).ravel()
+    offsets = 4 * quad
+    if not regions:
+        return xs, ys, offsets
+    region1 = np.zeros(quad[-1], dtype=bool)
+    region1[pos1] = True
+    return xs, ys, offsets, np.repeat(region1, 4)
+
+
+class MidpointEllipse(Rasterizer):
+    name = "midpoint_ellipse"
+    columns = ("xc", "yc", "rx", "ry")
+
+    def scalar(self, xc, yc, rx, ry):
+        return midpoint_ellipse(rx, ry, xc, yc)
+
+    def batch(self, rows):
+        return midpoint_ellipse_batch(rows)
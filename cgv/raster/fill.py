@@ -0,0 +1,82 @@
+"""Scanline polygon fill into a Framebuffer.
+
+Pixel (x, y) is filled when the point (x, y) is inside the polygon. Each
+scanline counts an edge when ``ymin <= y < ymax`` and a span covers
+``x_left <= x < x_right``, so polygons sharing an edge never both fill it.
+"""
+import numpy as np
+
+from .base import offsets_from_counts, runs
+
+RULES = ("evenodd", "nonzero")
+
+
+def scanline_spans(vertices, offsets, width, height, rule="evenodd"):
+    """Spans covering the polygons, as arrays ``y, x_start, x_stop, polygon``.
+
+    Polygons are an (M, 2) vertex array plus ``offsets`` of length P + 1.
+    Spans are clipped to ``[0, width) x [0, height)``, exclude ``x_stop``
+    and are sorted by polygon, then row, then x.
+    """
+    if rule not in RULES:
+        raise ValueError(f"unknown fill rule {rule!r}, expected one of {RULES}")
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    poly, _ = runs(counts)
+
+    # Edge i runs from vertex i to the next vertex of the same polygon.
+    nxt = np.arange(len(vertices)) + 1
+    last = offsets[1:][counts > 0] - 1
+    nxt[last] = offsets[:-1][counts > 0]
+    x0, y0 = vertices.T
+    x1, y1 = vertices[nxt].T
+
+    # Edge table: the rows each non-horizontal edge crosses, clipped to the
+    # framebuffer, with +1/-1 winding for upward/downward edges.
+    lo = np.clip(np.ceil(np.minimum(y0, y1)), 0, height).astype(np.int64)
+    hi = np.clip(np.ceil(np.maximum(y0, y1)), 0, height).astype(np.int64)
+    rows = np.where(y0 != y1, hi - lo, 0)
+    edge, r = runs(rows)
+    y = lo[edge] + r
+
+    # Active edges of every scanline at once: one crossing per (edge, row).
+    ex0, ey0, ex1, ey1 = x0[edge], y0[edge], x1[edge], y1[edge]
+    x = ex0 + (y - ey0) * (ex1 - ex0) / (ey1 - ey0)
+    order = np.lexsort((x, y, poly[edge]))
+    x, y, owner = x[order], y[order], poly[edge][order]
+
+    # Every (polygon, row) group has an even number of crossings and zero
+    # total winding, so plain cumsums give the inside state between
+    # crossing i and crossing i + 1 without resetting at group boundaries.
+    if rule == "evenodd":
+        inside = np.arange(len(x)) % 2 == 0
+    else:
+        inside = np.cumsum(np.where(ey1 > ey0, 1, -1)[order]) != 0
+    inside[-1:] = False
+
+    start = np.flatnonzero(inside)
+    x_start = np.clip(np.ceil(x[start]), 0, width).astype(np.int64)
+    x_stop = np.clip(np.ceil(x[start + 1]), 0, width).astype(np.int64)
+    keep = x_stop > x_start
+    return y[start][keep], x_start[keep], x_stop[keep], owner[start][keep]
+
+
+def fill_polygons(framebuffer, vertices, offsets, color=255, rule="evenodd"):
+    """Fill polygons into ``framebuffer``, one slice assignment per span.
+
+    ``vertices`` and ``offsets`` are as in :func:`scanline_spans`; a single
+    polygon can be passed as ``fill_polygon``. Returns the number of spans.
+    """
+    ys, starts, stops, _ = scanline_spans(vertices, offsets, framebuffer.width,
+                                          framebuffer.height, rule)
+    data = framebuffer.data
+    color = framebuffer.color(color)
+    for y, a, b in zip(ys.tolist(), starts.tolist(), stops.tolist()):
+        data[y, a:b] = color
+    return len(ys)
+
+
+def fill_polygon(framebuffer, points, color=255, rule="evenodd"):
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return fill_polygons(framebuffer, points, offsets_from_counts([len(points)]), color, rule)
@@ -0,0 +1,236 @@
+"""Golden pixel sets and a fuzzer for checking rasterizer backends.
+
+The scalar backends are the reference: ``generate`` rasterizes a fixed
+seeded set of primitives with them and stores rows and pixels as one
+compressed ``.npz`` per rasterizer. ``check`` runs any backend over the
+stored rows and ``fuzz`` over fresh random ones; both call it on all
+rows at once and again on groups of 2-3 rows, and report the first pixel
+that differs.
+
+Run from the repository root:
+
+    python -m cgv.raster.golden generate [golden]
+    python -m cgv.raster.golden check [golden] [--backend batch]
+    python -m cgv.raster.golden fuzz [--cases 10000] [--backend batch]
+
+``--backend`` is ``scalar``, ``batch`` or ``module:function`` for any
+function taking an (N, k) array and returning ``xs, ys, offsets``.
+"""
+import argparse
+import importlib
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from . import get_rasterizer, rasterizer_names
+from .base import offsets_from_counts
+
+# ``grouped`` is set when the backend only failed when called on a few
+# rows at a time (see ``in_groups``).
+Mismatch = namedtuple("Mismatch", "rasterizer primitive row pixel expected got grouped",
+                      defaults=(False,))
+
+
+def _lines(rng, n, reach):
+    start = rng.integers(-reach, reach, (n, 2))
+    return np.column_stack([start, start + rng.integers(-reach, reach + 1, (n, 2))])
+
+
+def _fractional_lines(rng, n, reach):
+    # A third of the coordinates stay whole, a third get exactly .5, where
+    # round() and the fixed-point DDA break ties, and a third get any
+    # fraction.
+    rows = _lines(rng, n, reach).astype(np.float64)
+    kind = rng.integers(0, 3, rows.shape)
+    rows += np.where(kind == 1, 0.5, np.where(kind == 2, rng.random(rows.shape), 0))
+    return rows
+
+
+def _radii(rng, shape, reach):
+    # Large and small radii mixed at random, so neighbouring rows in a
+    # batch are often very different sizes.
+    small = rng.integers(1, 8, shape)
+    return np.where(rng.random(shape) < 0.5, small, rng.integers(max(reach // 2, 1), reach, shape))
+
+
+def _circles(rng, n, reach):
+    return np.column_stack([rng.integers(-reach, reach, (n, 2)), _radii(rng, n, reach) - 1])
+
+
+def _ellipses(rng, n, reach):
+    return np.column_stack([rng.integers(-reach, reach, (n, 2)), _radii(rng, (n, 2), reach)])
+
+
+# Random rows for each rasterizer, (rng, count, coordinate range) -> (n, k),
+# and the default range: a few thousand pixels per primitive at most.
+SAMPLERS = {
+    "dda": (_fractional_lines, 1000),
+    "dda_fixed": (_fractional_lines, 1000),
+    "bresenham": (_lines, 1000),
+    "midpoint_circle": (_circles, 300),
+    "midpoint_ellipse": (_ellipses, 300),
+}
+
+
+def golden_rows(name, seed=0):
+    """The fixed rows stored in the golden set: every small case
+    exhaustively plus 500 seeded random ones of moderate size."""
+    rng = np.random.default_rng(seed)
+    if name in ("dda", "dda_fixed", "bresenham"):
+        # Half-pixel steps for the rasterizers that take fractions.
+        d = np.arange(-8, 9) if name == "bresenham" else np.arange(-16, 17) / 2
+        dx, dy = np.meshgrid(d, d)
+        small = np.column_stack([np.zeros((dx.size, 2), int), dx.ravel(), dy.ravel()])
+    elif name == "midpoint_circle":
+        small = np.column_stack([np.zeros((65, 2), int), np.arange(65)])
+    else:
+        r = np.arange(1, 25)
+        rx, ry = np.meshgrid(r, r)
+        small = np.column_stack([np.zeros((rx.size, 2), int), rx.ravel(), ry.ravel()])
+    sampler, reach = SAMPLERS[name]
+    return np.concatenate([small, sampler(rng, 500, reach // 3)])
+
+
+def resolve_backend(name, backend):
+    """``"scalar"``, ``"batch"``, ``"module:function"`` or a callable, as a
+    function from rows to ``xs, ys, offsets``."""
+    if callable(backend):
+        return backend
+    if backend in ("scalar", "batch"):
+        rasterizer = get_rasterizer(name)
+        return lambda rows: rasterizer.rasterize(rows, backend)
+    module, _, function = backend.partition(":")
+    return getattr(importlib.import_module(module), function)
+
+
+def in_groups(backend, sizes=(2, 3)):
+    """``backend`` called on consecutive groups of ``sizes`` rows in turn,
+    its results joined as if from one call. Batch code that works across
+    rows (segmented scans, shared caches) meets neighbours of unrelated
+    size here, which one large call evens out."""
+    def run(rows):
+        bounds = [0]
+        while bounds[-1] < len(rows):
+            bounds.append(min(bounds[-1] + sizes[len(bounds) % len(sizes)], len(rows)))
+        if len(bounds) < 2:
+            return backend(rows)
+        parts = [backend(rows[i:j]) for i, j in zip(bounds[:-1], bounds[1:])]
+        counts = np.concatenate([np.diff(offsets) for _, _, offsets in parts])
+        return (np.concatenate([xs for xs, _, _ in parts]),
+                np.concatenate([ys for _, ys, _ in parts]), offsets_from_counts(counts))
+    return run
+
+
+def _compare(name, rows, expected, backend):
+    # The whole rows in one call, then in small groups.
+    mismatch = first_mismatch(name, rows, expected, backend(rows))
+    if mismatch is None:
+        mismatch = first_mismatch(name, rows, expected, in_groups(backend)(rows))
+        if mismatch is not None:
+            mismatch = mismatch._replace(grouped=True)
+    return mismatch
+
+
+def first_mismatch(name, rows, expected, got):
+    """The first primitive and pixel where two ``xs, ys, offsets`` results
+    differ, or None. A missing pixel is reported as None."""
+    exs, eys, eoff = expected
+    gxs, gys, goff = got
+    eoff = np.asarray(eoff)
+    goff = np.asarray(goff)
+    if len(goff) != len(eoff):
+        raise ValueError(f"{name}: expected {len(eoff) - 1} primitives, got {len(goff) - 1}")
+    if np.array_equal(eoff, goff) and np.array_equal(exs, gxs) and np.array_equal(eys, gys):
+        return None
+    for i in range(len(rows)):
+        a = list(zip(exs[eoff[i]:eoff[i + 1]].tolist(), eys[eoff[i]:eoff[i + 1]].tolist()))
+        b = list(zip(gxs[goff[i]:goff[i + 1]].tolist(), gys[goff[i]:goff[i + 1]].tolist()))
+        if a == b:
+            continue
+        k = next((k for k, (p, q) in enumerate(zip(a, b)) if p != q), min(len(a), len(b)))
+        return Mismatch(name, i, tuple(np.asarray(rows[i]).tolist()), k,
+                        a[k] if k < len(a) else None, b[k] if k < len(b) else None)
+    return None
+
+
+def generate(directory="golden", names=None, seed=0):
+    """Write ``<name>.npz`` with rows, xs, ys and offsets from the scalar
+    reference for each rasterizer; returns the paths written."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names or rasterizer_names():
+        rows = golden_rows(name, seed)
+        xs, ys, offsets = get_rasterizer(name).rasterize(rows, "scalar")
+        path = directory / f"{name}.npz"
+        np.savez_compressed(path, rows=rows, xs=xs, ys=ys, offsets=offsets)
+        paths.append(path)
+    return paths
+
+
+def check(directory="golden", backend="batch", names=None):
+    """Compare ``backend`` against every stored golden set, called on all
+    rows at once and in groups of 2-3 rows; returns a list of Mismatch,
+    empty when all pixels match."""
+    mismatches = []
+    for name in names or rasterizer_names():
+        with np.load(Path(directory) / f"{name}.npz") as golden:
+            rows = golden["rows"]
+            expected = golden["xs"], golden["ys"], golden["offsets"]
+        mismatch = _compare(name, rows, expected, resolve_backend(name, backend))
+        if mismatch:
+            mismatches.append(mismatch)
+    return mismatches
+
+
+def fuzz(name, backend="batch", cases=10_000, seed=0, reach=None, chunk=1000):
+    """Random rows with coordinates up to ``reach`` (default per
+    rasterizer), checked against the scalar reference ``chunk`` at a time
+    and in groups of 2-3 rows; returns the first Mismatch or None."""
+    rng = np.random.default_rng(seed)
+    sampler, default_reach = SAMPLERS[name]
+    reach = reach or default_reach
+    reference = get_rasterizer(name)
+    candidate = resolve_backend(name, backend)
+    for start in range(0, cases, chunk):
+        # Mix small coordinates, where rounding ties are common, with large ones.
+        rows = sampler(rng, min(chunk, cases - start), reach if start % (2 * chunk) else 16)
+        mismatch = _compare(name, rows, reference.rasterize(rows, "scalar"), candidate)
+        if mismatch:
+            return mismatch
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["generate", "check", "fuzz"])
+    parser.add_argument("directory", nargs="?", default="golden")
+    parser.add_argument("--rasterizer", action="append", choices=rasterizer_names(),
+                        help="limit to one rasterizer; repeatable (default: all)")
+    parser.add_argument("--backend", default="batch")
+    parser.add_argument("--cases", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    names = args.rasterizer or rasterizer_names()
+
+    if args.command == "generate":
+        for path in generate(args.directory, names, args.seed):
+            print(f"wrote {path}")
+        return 0
+
+    if args.command == "check":
+        mismatches = check(args.directory, args.backend, names)
+    else:
+        mismatches = [m for m in (fuzz(name, args.backend, args.cases, args.seed) for name in names) if m]
+    for m in mismatches:
+        print(f"{m.rasterizer}: primitive {m.primitive} {m.row} differs at pixel {m.pixel}"
+              f"{' (in groups of 2-3 rows)' if m.grouped else ''}: "
+              f"expected {m.expected}, got {m.got}")
+    if not mismatches:
+        print(f"{args.command}: {', '.join(names)} match the scalar reference")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
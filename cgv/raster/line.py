@@ -0,0 +1,416 @@
+import itertools
+
+import numpy as np
+
+from .base import Rasterizer, blocks, offsets_from_counts, positions, runs
+
+# Segment classes for the straight-line fast paths.
+POINT = 0
+HORIZONTAL = 1
+VERTICAL = 2
+DIAGONAL = 3
+GENERAL = 4
+
+
+def classify_segments(segments):
+    """Class of each x0, y0, x1, y1 row: POINT, HORIZONTAL, VERTICAL and
+    DIAGONAL (45 degrees) for integer endpoints, GENERAL otherwise."""
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    integral = (seg == np.round(seg)).all(axis=1)
+    dx = np.abs(seg[:, 2] - seg[:, 0])
+    dy = np.abs(seg[:, 3] - seg[:, 1])
+    kind = np.full(len(seg), GENERAL, dtype=np.int8)
+    kind[integral & (dx == dy)] = DIAGONAL
+    kind[integral & (dy == 0)] = HORIZONTAL
+    kind[integral & (dx == 0)] = VERTICAL
+    kind[integral & (dx == 0) & (dy == 0)] = POINT
+    return kind
+
+
+def _straight(x0, y0, x1, y1):
+    # Every line algorithm here walks integer horizontal, vertical and
+    # 45-degree segments in unit steps, so they need no per-pixel loop.
+    if not (x0 == int(x0) and y0 == int(y0) and x1 == int(x1) and y1 == int(y1)):
+        return None
+    x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
+    dx = x1 - x0
+    dy = y1 - y0
+    if dx and dy and abs(dx) != abs(dy):
+        return None
+    n = max(abs(dx), abs(dy)) + 1
+    xs = range(x0, x1 + (1 if dx > 0 else -1), 1 if dx > 0 else -1) if dx else itertools.repeat(x0, n)
+    ys = range(y0, y1 + (1 if dy > 0 else -1), 1 if dy > 0 else -1) if dy else itertools.repeat(y0, n)
+    return list(zip(xs, ys))
+
+
+def dda(x0, y0, x1, y1):
+    straight = _straight(x0, y0, x1, y1)
+    if straight is not None:
+        return straight
+
+    points = []
+
+    dx = x1 - x0
+    dy = y1 - y0
+
+    steps = int(max(abs(dx), abs(dy)))
+    if steps == 0:
+        return [(round(x0), round(y0))]
+
+    x_inc = dx / steps
+    y_inc = dy / steps
+
+    x, y = x0, y0
+
+    for _ in range(steps + 1):
+        points.append((round(x), round(y)))
+        x += x_inc
+        y += y_inc
+
+    return points
+
+
+# Fractional bits of the fixed-point DDA. Positions are held in int64, so
+# their integer part has 47 bits rather than 16; the batch returns int32
+# pixels like the other rasterizers.
+FIXED_SHIFT = 16
+FIXED_ONE = 1 << FIXED_SHIFT
+FIXED_HALF = FIXED_ONE >> 1
+
+
+def dda_fixed(x0, y0, x1, y1):
+    """DDA on 16.16 fixed-point integers instead of floats.
+
+    The increment ``(x1 - x0) / steps`` is split into a whole number of
+    1/65536 units and a remainder that is carried like Bresenham's error
+    term, so after k steps x is exactly ``x0 + k * dx / steps`` truncated
+    to 1/65536 and never drifts, however long the line. Pixels are that
+    value rounded half up; they differ from :func:`dda` only at exact
+    halves (``round`` goes to even) and where float drift moved ``dda``.
+    """
+    straight = _straight(x0, y0, x1, y1)
+    if straight is not None:
+        return straight
+
+    steps = int(max(abs(x1 - x0), abs(y1 - y0)))
+    x = round(x0 * FIXED_ONE)
+    y = round(y0 * FIXED_ONE)
+    if steps == 0:
+        return [((x + FIXED_HALF) >> FIXED_SHIFT, (y + FIXED_HALF) >> FIXED_SHIFT)]
+
+    x_inc, x_rem = divmod(round(x1 * FIXED_ONE) - x, steps)
+    y_inc, y_rem = divmod(round(y1 * FIXED_ONE) - y, steps)
+    x_err = y_err = 0
+
+    points = []
+    for _ in range(steps + 1):
+        points.append(((x + FIXED_HALF) >> FIXED_SHIFT, (y + FIXED_HALF) >> FIXED_SHIFT))
+        x += x_inc
+        x_err += x_rem
+        if x_err >= steps:
+            x_err -= steps
+            x += 1
+        y += y_inc
+        y_err += y_rem
+        if y_err >= steps:
+            y_err -= steps
+            y += 1
+
+    return points
+
+
+def bresenham(x0, y0, x1, y1):
+    straight = _straight(x0, y0, x1, y1)
+    if straight is not None:
+        return straight
+
+    points = []
+
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+
+    err = dx - dy
+
+    while True:
+        points.append((x0, y0))
+
+        if x0 == x1 and y0 == y1:
+            break
+
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+
+    return points
+
+
+def _accumulate(start, inc, counts, out):
+    # Each row is start, inc, inc, ... so a row-wise cumsum repeats the
+    # scalar loop's sequence of float additions exactly, drift included.
+    cols = np.arange(int(counts.max()))
+    steps = np.empty((len(counts), len(cols)), dtype=np.float64)
+    steps[:, 0] = start
+    steps[:, 1:] = inc[:, None]
+    np.cumsum(steps, axis=1, out=steps)
+    np.rint(steps, out=steps)
+    out[...] = steps[cols < counts[:, None]]
+
+
+def _fill_rows(x0, y0, x_inc, y_inc, counts, xs, ys):
+    if counts.size * counts.max() <= 4 * xs.size:
+        _accumulate(x0, x_inc, counts, xs)
+        _accumulate(y0, y_inc, counts, ys)
+        return
+
+    # Lengths are too uneven to pad to one width: bucket the rows by the bit
+    # length of their pixel count so each block wastes at most half its width.
+    offsets = offsets_from_counts(counts)
+    buckets = np.frexp(counts.astype(np.float64))[1]
+    for b in np.unique(buckets):
+        rows = np.flatnonzero(buckets == b)
+        n = counts[rows]
+        dest = offsets[rows][:, None] + np.arange(int(n.max()))
+        dest = dest[dest < offsets[rows + 1][:, None]]
+        bx = np.empty(dest.size, dtype=np.int32)
+        by = np.empty(dest.size, dtype=np.int32)
+        _accumulate(x0[rows], x_inc[rows], n, bx)
+        _accumulate(y0[rows], y_inc[rows], n, by)
+        xs[dest] = bx
+        ys[dest] = by
+
+
+def dda_batch(segments, block=2048):
+    """Rasterize an (N, 4) array of x0, y0, x1, y1 rows with DDA.
+
+    Returns flat int32 ``xs`` and ``ys`` plus an ``offsets`` array of
+    length N + 1; the pixels of segment i are ``xs[offsets[i]:offsets[i + 1]]``.
+    The pixels match :func:`dda` exactly, including its rounding.
+    """
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x0, y0, x1, y1 = seg.T
+    dx = x1 - x0
+    dy = y1 - y0
+
+    steps = np.maximum(np.abs(dx), np.abs(dy)).astype(np.int64)
+    div = np.where(steps == 0, 1, steps)
+    x_inc = np.where(steps == 0, 0.0, dx / div)
+    y_inc = np.where(steps == 0, 0.0, dy / div)
+
+    counts = steps + 1
+    offsets = offsets_from_counts(counts)
+    xs = np.empty(offsets[-1], dtype=np.int32)
+    ys = np.empty(offsets[-1], dtype=np.int32)
+
+    # Consecutive segments write one contiguous run of the output, so each
+    # block is computed in place without a scatter.
+    for i in range(0, len(seg), block):
+        j = min(i + block, len(seg))
+        lo, hi = offsets[i], offsets[j]
+        _fill_rows(x0[i:j], y0[i:j], x_inc[i:j], y_inc[i:j], counts[i:j],
+                   xs[lo:hi], ys[lo:hi])
+
+    return xs, ys, offsets
+
+
+def _bresenham_rows(seg, out, dtype):
+    x0, y0, x1, y1 = seg.T
+    dx = np.abs(x1 - x0)
+    dy = np.abs(y1 - y0)
+    sx = np.where(x0 < x1, 1, -1)
+    sy = np.where(y0 < y1, 1, -1)
+
+    # Normalize every octant to a walk of k = 0..major along the major axis.
+    # The error term of the scalar loop then has the closed form
+    # minor = (2 * k * minor_delta + major - 1) // (2 * major).
+    x_major = dx >= dy
+    major = np.maximum(dx, dy)
+    counts = major + 1
+
+    def per_pixel(values):
+        return np.repeat(values.astype(dtype), counts)
+
+    k = positions(counts, dtype)
+    minor = per_pixel(2 * np.minimum(dx, dy))
+    minor *= k
+    minor += per_pixel(np.maximum(major - 1, 0))
+    minor //= per_pixel(2 * np.maximum(major, 1))
+
+    # Un-normalize: each coordinate is start + a * k + b * minor with
+    # a, b in {-1, 0, 1} chosen per segment by its octant.
+    for axis, start, step, along in ((0, x0, sx, x_major), (1, y0, sy, ~x_major)):
+        a = np.where(along, step, 0)
+        coord = per_pixel(a)
+        coord *= k
+        coord += per_pixel(start)
+        b = per_pixel(step - a)
+        b *= minor
+        coord += b
+        out[axis] = coord
+
+
+def bresenham_batch(segments, out=None, block=32768):
+    """Rasterize an (N, 4) array of integer x0, y0, x1, y1 rows with Bresenham.
+
+    Segments may lie in any octant. Returns ``xs``, ``ys`` and ``offsets``
+    like :func:`dda_batch`; the pixels match :func:`bresenham` exactly.
+    ``out`` may be a preallocated (2, total) int32 array, where total is
+    the sum of ``max(dx, dy) + 1`` over all segments.
+    """
+    seg = np.asarray(segments, dtype=np.int64).reshape(-1, 4)
+    dx = np.abs(seg[:, 2] - seg[:, 0])
+    dy = np.abs(seg[:, 3] - seg[:, 1])
+    counts = np.maximum(dx, dy) + 1
+    offsets = offsets_from_counts(counts)
+    if out is None:
+        out = np.empty((2, offsets[-1]), dtype=np.int32)
+    elif out.shape != (2, offsets[-1]):
+        raise ValueError(f"out must have shape (2, {offsets[-1]}), got {out.shape}")
+    if len(seg) == 0:
+        return out[0], out[1], offsets
+
+    # int32 temporaries are markedly faster; fall back to int64 only when
+    # the error numerator or a coordinate could overflow them.
+    bound = max(int((2 * dx * dy + counts).max()), int(np.abs(seg).max() + counts.max()))
+    dtype = np.int32 if bound < 2**31 else np.int64
+
+    for i, j in blocks(offsets, block):
+        _bresenham_rows(seg[i:j], out[:, offsets[i]:offsets[j]], dtype)
+
+    return out[0], out[1], offsets
+
+
+def _dda_fixed_rows(x, y, dx, dy, steps, counts, out):
+    # After k steps the carried remainder leaves exactly
+    # start + floor(k * delta / steps) in 1/65536 units. k * delta itself
+    # overflows int64 past about 2**23 steps, so it is split as
+    # k * (delta // steps) + k * (delta % steps) // steps, where the
+    # second product stays below steps**2.
+    k = positions(counts)
+    denominator = np.repeat(steps, counts)
+    for axis, start, delta in ((0, x, dx), (1, y, dy)):
+        q, r = np.divmod(delta, steps)
+        v = k * np.repeat(r, counts)
+        v //= denominator
+        v += np.repeat(start + FIXED_HALF, counts)
+        q = np.repeat(q, counts)
+        q *= k
+        v += q
+        v >>= FIXED_SHIFT
+        out[axis] = v
+
+
+def dda_fixed_batch(segments, block=32768):
+    """Rasterize an (N, 4) array of x0, y0, x1, y1 rows with the
+    fixed-point DDA; pixels match :func:`dda_fixed` exactly.
+
+    Returns ``xs``, ``ys`` and ``offsets`` like :func:`dda_batch`.
+    """
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    steps = np.maximum(np.abs(seg[:, 2] - seg[:, 0]), np.abs(seg[:, 3] - seg[:, 1]))
+    steps = steps.astype(np.int64)
+    fixed = np.rint(seg * FIXED_ONE).astype(np.int64)
+    x, y = fixed[:, 0], fixed[:, 1]
+    dx, dy = fixed[:, 2] - x, fixed[:, 3] - y
+    counts = steps + 1
+    steps = np.maximum(steps, 1)
+    offsets = offsets_from_counts(counts)
+    out = np.empty((2, offsets[-1]), dtype=np.int32)
+
+    for i, j in blocks(offsets, block):
+        _dda_fixed_rows(x[i:j], y[i:j], dx[i:j], dy[i:j], steps[i:j], counts[i:j],
+                        out[:, offsets[i]:offsets[j]])
+
+    return out[0], out[1], offsets
+
+
+def draw_straight(framebuffer, segments, kind, color=255):
+    """Draw the non-GENERAL rows of ``segments`` (classes from
+    :func:`classify_segments`): one slice assignment per horizontal or
+    vertical span and one bulk write for all diagonals and points.
+    Returns the pixel count of every row, 0 for GENERAL ones."""
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4).astype(np.int64)
+    x0, y0, x1, y1 = seg.T
+    counts = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)) + 1
+    counts[kind == GENERAL] = 0
+    data, value = framebuffer.packed(color)
+    w, h = framebuffer.width, framebuffer.height
+
+    # Spans are clipped to the framebuffer; ones left empty are skipped so
+    # no slice bound goes negative and wraps around.
+    rows = np.flatnonzero((kind == HORIZONTAL) & (y0 >= 0) & (y0 < h))
+    lo = np.maximum(np.minimum(x0[rows], x1[rows]), 0)
+    hi = np.minimum(np.maximum(x0[rows], x1[rows]), w - 1)
+    keep = lo <= hi
+    for y, a, b in zip(y0[rows][keep].tolist(), lo[keep].tolist(), hi[keep].tolist()):
+        data[y, a:b + 1] = value
+
+    rows = np.flatnonzero((kind == VERTICAL) & (x0 >= 0) & (x0 < w))
+    lo = np.maximum(np.minimum(y0[rows], y1[rows]), 0)
+    hi = np.minimum(np.maximum(y0[rows], y1[rows]), h - 1)
+    keep = lo <= hi
+    for x, a, b in zip(x0[rows][keep].tolist(), lo[keep].tolist(), hi[keep].tolist()):
+        data[a:b + 1, x] = value
+
+    rows = np.flatnonzero((kind == DIAGONAL) | (kind == POINT))
+    which, k = runs(counts[rows])
+    which = rows[which]
+    framebuffer.set_pixels(x0[which] + np.sign(x1 - x0)[which] * k,
+                           y0[which] + np.sign(y1 - y0)[which] * k, color)
+    return counts
+
+
+class _Line(Rasterizer):
+    columns = ("x0", "y0", "x1", "y1")
+
+    def draw(self, framebuffer, rows, color=255, backend="batch"):
+        """Like :meth:`Rasterizer.draw`, but horizontal, vertical, 45-degree
+        and zero-length segments skip the rasterizer (see
+        :func:`draw_straight`)."""
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+        kind = classify_segments(rows)
+        counts = draw_straight(framebuffer, rows, kind, color)
+        general = np.flatnonzero(kind == GENERAL)
+        if len(general):
+            xs, ys, offsets = self.rasterize(rows[general], backend)
+            framebuffer.set_pixels(xs, ys, color)
+            counts[general] = np.diff(offsets)
+        return offsets_from_counts(counts)
+
+
+class DDA(_Line):
+    name = "dda"
+    dtype = np.float64
+
+    def scalar(self, x0, y0, x1, y1):
+        return dda(x0, y0, x1, y1)
+
+    def batch(self, rows):
+        return dda_batch(rows)
+
+
+class Bresenham(_Line):
+    name = "bresenham"
+
+    def scalar(self, x0, y0, x1, y1):
+        return bresenham(x0, y0, x1, y1)
+
+    def batch(self, rows):
+        return bresenham_batch(rows)
+
+
+class FixedDDA(_Line):
+    name = "dda_fixed"
+    dtype = np.float64
+
+    def scalar(self, x0, y0, x1, y1):
+        return dda_fixed(x0, y0, x1, y1)
+
+    def batch(self, rows):
+        return dda_fixed_batch(rows)
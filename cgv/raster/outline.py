@@ -0,0 +1,100 @@
+"""Polylines and polygon outlines from vertex arrays.
+
+Consecutive edges share a vertex, so rasterizing them one by one emits
+every joint pixel twice (and a closed outline's first pixel once more at
+the end). Here all edges of all polylines go through one batch call and
+the repeated joint pixels are dropped. Polylines use the vertices and
+``offsets`` layout of :mod:`cgv.raster.fill`.
+"""
+import numpy as np
+
+from . import get_rasterizer
+from .base import offsets_from_counts, runs
+
+
+def _edges(vertices, offsets, closed):
+    # Edge list: polyline of each edge, its index within the polyline, its
+    # two endpoints and whether it is the last edge of a closed outline. A
+    # single vertex is one zero-length edge; closing needs at least three
+    # vertices, and an outline whose last vertex repeats its first is
+    # closed already, so it gets no extra edge.
+    counts = np.diff(offsets)
+    closes = closed & (counts >= 3)
+    repeated = np.zeros(len(counts), dtype=bool)
+    repeated[closes] = (vertices[offsets[:-1][closes]] == vertices[offsets[1:][closes] - 1]).all(axis=1)
+    edge_counts = np.where(counts >= 2, counts - 1 + (closes & ~repeated), np.minimum(counts, 1))
+    poly, k = runs(edge_counts)
+    a = offsets[:-1][poly] + k
+    b = np.where(k + 1 < counts[poly], a + 1, offsets[:-1][poly])
+    closing = closes[poly] & (k == edge_counts[poly] - 1)
+    return poly, k, np.column_stack([vertices[a], vertices[b]]), closing
+
+
+def polylines_batch(vertices, offsets, closed=False, method="bresenham"):
+    """Rasterize every polyline with line rasterizer ``method``.
+
+    Returns ``xs``, ``ys`` and per-polyline ``offsets``. Pixels are in edge
+    order; an edge's first pixel is dropped when it repeats the previous
+    edge's last one, and a closed outline's last pixel when it repeats the
+    first.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    poly, k, segments, closing = _edges(vertices, offsets, closed)
+    xs, ys, edge_offsets = get_rasterizer(method).batch(segments)
+    if len(xs) == 0:
+        return xs, ys, np.zeros(len(offsets), dtype=np.int64)
+
+    edge, _ = runs(np.diff(edge_offsets))
+    first = edge_offsets[:-1]
+    repeat = np.zeros(len(xs), dtype=bool)
+    joint = first[(k > 0) & (first > 0)]
+    repeat[joint] = (xs[joint] == xs[joint - 1]) & (ys[joint] == ys[joint - 1])
+
+    counts = np.diff(offsets)
+    closing = np.flatnonzero(closing)
+    last = edge_offsets[closing + 1] - 1
+    start = edge_offsets[closing - k[closing]]
+    repeat[last] |= (xs[last] == xs[start]) & (ys[last] == ys[start]) & (last > start)
+
+    keep = ~repeat
+    owner = poly[edge]
+    return xs[keep], ys[keep], offsets_from_counts(np.bincount(owner[keep], minlength=len(counts)))
+
+
+def polyline(points, closed=False, method="bresenham"):
+    """Pixels of one polyline as a list of (x, y), joints emitted once."""
+    points = np.asarray(points).reshape(-1, 2)
+    xs, ys, _ = polylines_batch(points, [0, len(points)], closed, method)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def draw_polylines(framebuffer, vertices, offsets, color=255, closed=False, method="bresenham"):
+    """Draw all edges of all polylines with a single line ``draw`` call,
+    so straight edges take the slice-fill fast paths. Returns the edge
+    offsets of the drawn pixels."""
+    vertices = np.asarray(vertices).reshape(-1, 2)
+    _, _, segments, _ = _edges(vertices, np.asarray(offsets, dtype=np.int64), closed)
+    return get_rasterizer(method).draw(framebuffer, segments, color)
+
+
+def rectangles(rects):
+    """Outline vertices and offsets for an (N, 4) array of x0, y0, x1, y1
+    corners, to pass with ``closed=True``."""
+    x0, y0, x1, y1 = np.asarray(rects).reshape(-1, 4).T
+    corners = np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y0]),
+                        np.column_stack([x1, y1]), np.column_stack([x0, y1])], axis=1)
+    return corners.reshape(-1, 2), np.arange(0, 4 * len(x0) + 1, 4)
+
+
+def draw_rectangles(framebuffer, rects, color=255, method="bresenham"):
+    vertices, offsets = rectangles(rects)
+    return draw_polylines(framebuffer, vertices, offsets, color, True, method)
+
+
+def plot_polylines(vertices, offsets, closed=False, method="bresenham", ax=None, **kwargs):
+    """Scatter every polyline's pixels with one matplotlib call."""
+    from ..plot import plot_pixels
+
+    xs, ys, _ = polylines_batch(vertices, offsets, closed, method)
+    return plot_pixels(xs, ys, ax=ax, **kwargs)
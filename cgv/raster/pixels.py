@@ -0,0 +1,122 @@
+"""Compact pixel containers and conversions to the lab list formats.
+
+A list of ``(x, y)`` tuples costs around 100 bytes per pixel and a pair of
+``x_points, y_points`` lists about 60. A structured array holds the same
+pixels in 4 bytes (int16 coordinates) or 8 (int32), and line output can
+shrink further to run-length spans: one ``SPAN`` row per horizontal or
+vertical run of unit steps.
+"""
+import itertools
+
+import numpy as np
+
+from .base import offsets_from_counts, runs
+
+PIXEL16 = np.dtype([("x", "<i2"), ("y", "<i2")])
+PIXEL32 = np.dtype([("x", "<i4"), ("y", "<i4")])
+
+# A run of |length| pixels from (x, y), stepping by sign(length) along y
+# when ``vertical`` is set and along x otherwise.
+SPAN = np.dtype([("x", "<i4"), ("y", "<i4"), ("length", "<i4"), ("vertical", "u1")])
+
+
+def pixel_dtype(xs, ys):
+    """PIXEL16 when every coordinate fits in int16, else PIXEL32."""
+    info = np.iinfo(np.int16)
+    if len(xs) == 0:
+        return PIXEL16
+    lo = min(int(np.min(xs)), int(np.min(ys)))
+    hi = max(int(np.max(xs)), int(np.max(ys)))
+    return PIXEL16 if info.min <= lo and hi <= info.max else PIXEL32
+
+
+def compact(xs, ys, dtype=None):
+    """Pack coordinate arrays into one structured array of x, y fields."""
+    pixels = np.empty(len(xs), dtype=dtype or pixel_dtype(xs, ys))
+    pixels["x"] = xs
+    pixels["y"] = ys
+    return pixels
+
+
+def from_points(points, dtype=None):
+    """Structured array from a list of (x, y) tuples (``Lab3/my.py``)."""
+    flat = np.fromiter(itertools.chain.from_iterable(points), dtype=np.int64,
+                       count=2 * len(points)).reshape(-1, 2)
+    return compact(flat[:, 0], flat[:, 1], dtype)
+
+
+def to_points(pixels):
+    return list(zip(pixels["x"].tolist(), pixels["y"].tolist()))
+
+
+def from_lists(x_points, y_points, dtype=None):
+    """Structured array from parallel ``x_points, y_points`` lists."""
+    return compact(np.asarray(x_points, dtype=np.int64), np.asarray(y_points, dtype=np.int64), dtype)
+
+
+def to_lists(pixels):
+    return pixels["x"].tolist(), pixels["y"].tolist()
+
+
+def encode_spans(xs, ys, offsets=None):
+    """Run-length encode pixels into ``SPAN`` rows.
+
+    Each primitive (``offsets`` as returned by the batch rasterizers; the
+    default is one primitive) is cut into runs along its dominant axis:
+    horizontal runs for mostly-horizontal output such as shallow
+    Bresenham lines, vertical runs otherwise. Pixels that do not continue
+    a run start a new one, so any pixel sequence round-trips. Returns
+    ``spans`` and ``span_offsets``, so primitive i owns
+    ``spans[span_offsets[i]:span_offsets[i + 1]]``.
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    if offsets is None:
+        offsets = np.array([0, len(xs)])
+    offsets = np.asarray(offsets, dtype=np.int64)
+    primitive = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    dx = np.diff(xs, prepend=0)
+    dy = np.diff(ys, prepend=0)
+    first = np.zeros(len(xs), dtype=bool)
+    first[offsets[:-1][offsets[:-1] < len(xs)]] = True
+    h_step = ~first & (dy == 0) & (np.abs(dx) == 1)
+    v_step = ~first & (dx == 0) & (np.abs(dy) == 1)
+    vertical = (np.bincount(primitive, v_step, len(offsets) - 1)
+                > np.bincount(primitive, h_step, len(offsets) - 1))
+    along = vertical[primitive]
+    step = np.where(along, v_step, h_step)
+    d = np.where(along, dy, dx)
+
+    # A pixel extends the run of the pixel before it if it takes a unit
+    # step along the axis in the same direction as that pixel did, or if
+    # the pixel before did not take such a step (so it starts the run).
+    prev_step = np.roll(step, 1)
+    prev_d = np.roll(d, 1)
+    extends = step & (~prev_step | (d == prev_d))
+    starts = np.flatnonzero(~extends)
+
+    counts = np.diff(np.append(starts, len(xs)))
+    spans = np.empty(len(starts), dtype=SPAN)
+    spans["x"] = xs[starts]
+    spans["y"] = ys[starts]
+    direction = np.where(counts > 1, d[np.minimum(starts + 1, len(xs) - 1)], 1)
+    spans["length"] = counts * direction
+    spans["vertical"] = along[starts]
+    span_offsets = np.searchsorted(starts, offsets)
+    return spans, span_offsets
+
+
+def decode_spans(spans, span_offsets=None):
+    """Inverse of :func:`encode_spans`: ``xs``, ``ys`` and pixel ``offsets``."""
+    length = spans["length"].astype(np.int64)
+    counts = np.abs(length)
+    which, k = runs(counts)
+    step = np.sign(length)[which] * k
+    vertical = spans["vertical"][which].astype(bool)
+    xs = spans["x"][which] + np.where(vertical, 0, step)
+    ys = spans["y"][which] + np.where(vertical, step, 0)
+    if span_offsets is None:
+        span_offsets = np.array([0, len(spans)])
+    offsets = offsets_from_counts(counts)[np.asarray(span_offsets)]
+    return xs.astype(np.int32), ys.astype(np.int32), offsets
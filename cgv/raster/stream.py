@@ -0,0 +1,167 @@
+"""Generators that rasterize one primitive as fixed-size NumPy blocks.
+
+The scalar functions build a list of every pixel and the batch ones a
+flat array, so a line from (0, 0) to (10**8, 3) needs gigabytes either
+way. These yield ``(xs, ys)`` int64 arrays of exactly ``block`` pixels
+(the last one may be shorter) in the same order as the scalar function,
+computing only one block at a time, so peak memory depends on ``block``
+and not on the primitive.
+"""
+import numpy as np
+
+from .circle import _MIRRORS
+from .ellipse import midpoint_ellipse_batch
+
+# int64 headroom: the Bresenham numerator is 2 * k * minor_delta and the
+# circle works with 4 * r^2.
+MAX_EXTENT = 2**30
+
+
+def reblock(pieces, block):
+    """Regroup an iterable of ``(xs, ys)`` arrays of any length into
+    arrays of exactly ``block`` pixels; the last one may be shorter."""
+    xs_parts, ys_parts, held = [], [], 0
+    for xs, ys in pieces:
+        xs_parts.append(xs)
+        ys_parts.append(ys)
+        held += len(xs)
+        if held < block:
+            continue
+        xs = np.concatenate(xs_parts)
+        ys = np.concatenate(ys_parts)
+        full = held - held % block
+        for i in range(0, full, block):
+            yield xs[i:i + block], ys[i:i + block]
+        xs_parts, ys_parts, held = [xs[full:]], [ys[full:]], held - full
+    if held:
+        yield np.concatenate(xs_parts), np.concatenate(ys_parts)
+
+
+def _dda_axis(start, inc, lo, hi, carry):
+    # Values lo..hi-1 of start, start + inc, start + inc + inc, ...; a
+    # cumsum from the previous block's last value repeats the scalar
+    # loop's float additions exactly.
+    if lo == 0:
+        values = np.full(hi, inc)
+        values[0] = start
+    else:
+        values = np.full(hi - lo + 1, inc)
+        values[0] = carry
+    np.cumsum(values, out=values)
+    return values if lo == 0 else values[1:]
+
+
+def iter_dda(x0, y0, x1, y1, block=65536):
+    """:func:`~cgv.raster.line.dda` as a generator of pixel blocks."""
+    dx = x1 - x0
+    dy = y1 - y0
+    steps = int(max(abs(dx), abs(dy)))
+    if steps == 0:
+        yield np.array([round(x0)], np.int64), np.array([round(y0)], np.int64)
+        return
+    x_inc = dx / steps
+    y_inc = dy / steps
+    x = y = None
+    for lo in range(0, steps + 1, block):
+        hi = min(lo + block, steps + 1)
+        x = _dda_axis(float(x0), x_inc, lo, hi, x if x is None else x[-1])
+        y = _dda_axis(float(y0), y_inc, lo, hi, y if y is None else y[-1])
+        yield np.rint(x).astype(np.int64), np.rint(y).astype(np.int64)
+
+
+def iter_bresenham(x0, y0, x1, y1, block=65536):
+    """:func:`~cgv.raster.line.bresenham` as a generator of pixel blocks.
+
+    Uses the same closed form as :func:`~cgv.raster.line.bresenham_batch`,
+    so each block is computed directly from its pixel indices.
+    """
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    major = max(dx, dy)
+    if major >= MAX_EXTENT:
+        raise ValueError(f"segment spans {major} pixels, more than {MAX_EXTENT}")
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    minor_delta = 2 * min(dx, dy)
+    bias = max(major - 1, 0)
+    denominator = 2 * max(major, 1)
+    ax, ay = (sx, 0) if dx >= dy else (0, sy)
+    for lo in range(0, major + 1, block):
+        k = np.arange(lo, min(lo + block, major + 1), dtype=np.int64)
+        minor = (k * minor_delta + bias) // denominator
+        yield x0 + ax * k + (sx - ax) * minor, y0 + ay * k + (sy - ay) * minor
+
+
+def _isqrt(n):
+    s = np.sqrt(n.astype(np.float64)).astype(np.int64)
+    for _ in range(2):
+        s -= s * s > n
+        s += (s + 1) * (s + 1) <= n
+    return s
+
+
+def _circle_octant(radius, block):
+    # Octant points of midpoint_circle in blocks of rows y. The largest x
+    # with x * (x - 1) <= r^2 - y^2 is where the decision variable puts the
+    # pixel; the scalar loop steps x down by at most one per row, which
+    # makes x + y a running max (as in midpoint_ellipse_batch).
+    if radius == 0:
+        yield np.zeros(1, np.int64), np.zeros(1, np.int64)
+        return
+    h = -1
+    for lo in range(0, radius + 1, block):
+        y = np.arange(lo, min(lo + block, radius + 1), dtype=np.int64)
+        x = (1 + _isqrt(1 + 4 * (radius * radius - y * y))) // 2 + y
+        x[0] = max(x[0], h)
+        np.maximum.accumulate(x, out=x)
+        h = x[-1]
+        x -= y
+        # The octant ends with the first point on or past the diagonal.
+        end = np.flatnonzero(x <= y)
+        if len(end):
+            yield x[:end[0] + 1], y[:end[0] + 1]
+            return
+        yield x, y
+
+
+def iter_midpoint_circle(radius, xc=0, yc=0, block=65536):
+    """:func:`~cgv.raster.circle.midpoint_circle` as a generator of pixel
+    blocks, without the Python loop over the octant."""
+    if radius < 0:
+        raise ValueError(f"radius must be non-negative, got {radius}")
+    if radius >= MAX_EXTENT:
+        raise ValueError(f"radius must be below {MAX_EXTENT}, got {radius}")
+    sx, sy, swap = (np.array(col) for col in zip(*_MIRRORS))
+    side = 2 * radius + 1
+
+    def mirrored(octant_blocks):
+        # Mirrors repeat pixels only within one octant point or, on the
+        # diagonal, between the last point and the one before it, so each
+        # block is deduplicated together with the previous block's last
+        # point, whose pixels were already emitted.
+        prev = None
+        for x, y in octant_blocks:
+            if prev is not None:
+                x = np.concatenate([prev[0], x])
+                y = np.concatenate([prev[1], y])
+            dx = (sx * np.where(swap, y[:, None], x[:, None])).ravel()
+            dy = (sy * np.where(swap, x[:, None], y[:, None])).ravel()
+            _, first = np.unique((dx + radius) * side + (dy + radius), return_index=True)
+            first.sort()
+            if prev is not None:
+                first = first[first >= 8]
+            yield dx[first] + xc, dy[first] + yc
+            prev = x[-1:], y[-1:]
+
+    return reblock(mirrored(_circle_octant(radius, max(block // 8, 1))), block)
+
+
+def iter_midpoint_ellipse(rx, ry, xc=0, yc=0, block=65536):
+    """:func:`~cgv.raster.ellipse.midpoint_ellipse` as a generator of pixel
+    blocks. Radii are capped at ``ellipse.MAX_RADIUS``, so one ellipse is at
+    most about 2**18 pixels and is rasterized whole, then sliced."""
+    xs, ys, _ = midpoint_ellipse_batch([[xc, yc, rx, ry]])
+    xs = xs.astype(np.int64)
+    ys = ys.astype(np.int64)
+    for i in range(0, len(xs), block):
+        yield xs[i:i + block], ys[i:i + block]
@@ -0,0 +1,153 @@
+"""Tiled rasterization across processes into a shared framebuffer.
+
+The framebuffer is split into ``tile`` x ``tile`` squares and every
+primitive is binned into the tiles its bounding box touches. Workers
+rasterize one tile each with the batch backend and write only the pixels
+inside that tile, straight into a ``multiprocessing.shared_memory`` copy of
+the framebuffer, so tiles never race and no pixel is pickled. Within a
+tile primitives keep their input order, so overlapping pixels end up with
+the same color as a single ``Rasterizer.draw`` call.
+
+Primitives crossing several tiles are rasterized once per tile, so long
+diagonal lines cost more than on one core; short primitives in a large
+scene scale with the number of workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..framebuffer import Framebuffer
+from . import get_rasterizer
+from .base import offsets_from_counts, runs
+
+
+def _line_bbox(rows):
+    x0, y0, x1, y1 = rows.T
+    return (np.floor(np.minimum(x0, x1)), np.floor(np.minimum(y0, y1)),
+            np.ceil(np.maximum(x0, x1)), np.ceil(np.maximum(y0, y1)))
+
+
+def _circle_bbox(rows):
+    xc, yc, r = rows.T
+    return xc - r, yc - r, xc + r, yc + r
+
+
+def _ellipse_bbox(rows):
+    xc, yc, rx, ry = rows.T
+    return xc - rx, yc - ry, xc + rx, yc + ry
+
+
+BBOXES = {
+    "dda": _line_bbox,
+    "dda_fixed": _line_bbox,
+    "bresenham": _line_bbox,
+    "midpoint_circle": _circle_bbox,
+    "midpoint_ellipse": _ellipse_bbox,
+}
+
+
+def bin_tiles(name, rows, width, height, tile):
+    """Bin primitives by bounding box.
+
+    Returns ``(tiles, order, offsets)``: tile ``tiles[t]`` (an index into
+    the row-major tile grid) gets primitives
+    ``order[offsets[t]:offsets[t + 1]]`` in input order. Tiles with nothing
+    in them and primitives entirely off-screen are left out.
+    """
+    cols = -(-width // tile)
+    tile_rows = -(-height // tile)
+    xmin, ymin, xmax, ymax = (np.asarray(v, dtype=np.int64) for v in BBOXES[name](rows))
+    visible = np.flatnonzero((xmax >= 0) & (ymax >= 0) & (xmin < width) & (ymin < height))
+    tx0 = np.clip(xmin[visible] // tile, 0, cols - 1)
+    ty0 = np.clip(ymin[visible] // tile, 0, tile_rows - 1)
+    tx1 = np.clip(xmax[visible] // tile, 0, cols - 1)
+    ty1 = np.clip(ymax[visible] // tile, 0, tile_rows - 1)
+
+    spanx = tx1 - tx0 + 1
+    which, k = runs(spanx * (ty1 - ty0 + 1))
+    tile_ids = (ty0[which] + k // spanx[which]) * cols + tx0[which] + k % spanx[which]
+    sort = np.argsort(tile_ids, kind="stable")
+    tiles, counts = np.unique(tile_ids[sort], return_counts=True)
+    return tiles, visible[which[sort]], offsets_from_counts(counts)
+
+
+# Worker pools by size, kept across calls: starting the processes costs
+# more than rendering a modest scene.
+_pools = {}
+
+
+def _pool(workers):
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(workers)
+    return _pools[workers]
+
+
+def _render_tile(shared, name, color, box, index):
+    # ``shared`` names the framebuffer and rows blocks; attaching is cheap,
+    # so each task maps them for its own duration only.
+    (fb_name, fb_shape, mode), (rows_name, rows_shape) = shared
+    fb_block = shared_memory.SharedMemory(fb_name)
+    rows_block = shared_memory.SharedMemory(rows_name)
+    try:
+        data = np.ndarray(fb_shape, dtype=np.uint8, buffer=fb_block.buf)
+        rows = np.ndarray(rows_shape, dtype=np.float64, buffer=rows_block.buf)
+        x0, y0, x1, y1 = box
+        xs, ys, _ = get_rasterizer(name).batch(rows[index])
+        keep = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        xs = xs[keep]
+        Framebuffer.from_array(data, mode).set_pixels(xs, ys[keep], color)
+        return len(xs)
+    finally:
+        # Views into a block must be gone before it can be closed.
+        data = rows = None
+        fb_block.close()
+        rows_block.close()
+
+
+def render_tiled(framebuffer, name, rows, color=255, tile=256, workers=None):
+    """Draw ``rows`` of rasterizer ``name`` into ``framebuffer`` tile by
+    tile on ``workers`` processes (default: one per CPU; 1 runs in this
+    process). The pool for each worker count is started on first use and
+    kept. Returns the number of pixels written."""
+    rasterizer = get_rasterizer(name)
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(rasterizer.columns))
+    workers = workers or os.cpu_count() or 1
+    tiles, order, offsets = bin_tiles(name, rows, framebuffer.width, framebuffer.height, tile)
+    if len(tiles) == 0:
+        return 0
+    color = framebuffer.color(color)
+    cols = -(-framebuffer.width // tile)
+    tasks = []
+    for t, tile_id in enumerate(tiles.tolist()):
+        x0 = tile_id % cols * tile
+        y0 = tile_id // cols * tile
+        box = (x0, y0, min(x0 + tile, framebuffer.width), min(y0 + tile, framebuffer.height))
+        tasks.append((name, color, box, order[offsets[t]:offsets[t + 1]]))
+
+    data = framebuffer.data
+    fb_block = shared_memory.SharedMemory(create=True, size=data.nbytes)
+    rows_block = shared_memory.SharedMemory(create=True, size=max(rows.nbytes, 1))
+    try:
+        np.ndarray(data.shape, np.uint8, buffer=fb_block.buf)[...] = data
+        np.ndarray(rows.shape, np.float64, buffer=rows_block.buf)[...] = rows
+        shared = ((fb_block.name, data.shape, framebuffer.mode), (rows_block.name, rows.shape))
+        if workers == 1:
+            written = sum(_render_tile(shared, *task) for task in tasks)
+        else:
+            pool = _pool(workers)
+            try:
+                futures = [pool.submit(_render_tile, shared, *task) for task in tasks]
+                written = sum(f.result() for f in futures)
+            except BrokenProcessPool:
+                del _pools[workers]
+                raise
+        data[...] = np.ndarray(data.shape, np.uint8, buffer=fb_block.buf)
+    finally:
+        fb_block.close()
+        fb_block.unlink()
+        rows_block.close()
+        rows_block.unlink()
+    return written